@@ -12,14 +12,17 @@ import numpy as np
 
 from tuner_audio.audio_analyzer import AudioAnalyzer
 from tuner_audio.threading_helper import ProtectedList
+from tuner_audio.metrics import MetricsDumper, StageTimer, registry
 
 from tuner_appearance_manager.color_manager import ColorManager
 from tuner_appearance_manager.image_manager import ImageManager
 from tuner_appearance_manager.font_manager import FontManager
-from tuner_appearance_manager.timing import Timer
 
-from tuner_ui_parts.main_frame import MainFrame
-from tuner_ui_parts.ukulele_frame import UkuleleFrame
+from tuner_audio.instruments import INSTRUMENTS, get_instrument, load_user_tunings, next_instrument
+from tuner_audio.note_table import NoteTable, NOTE_NAMES
+from tuner_audio.pitch_tracker import PitchTracker
+
+from tuner_ui_parts.tuner_frame import TunerFrame
 from tuner_ui_parts.settings_frame import SettingsFrame
 
 from settings import Settings
@@ -60,25 +63,48 @@ class App(tkinter.Tk):
         self.font_manager = FontManager()
         self.image_manager = ImageManager(self.main_path)
         self.frequency_queue = ProtectedList()
+        self.strings_queue = ProtectedList()
+
+        load_user_tunings(self.main_path + Settings.USER_TUNINGS_PATH)
 
-        # Guitar tuner
-        self.main_frame = MainFrame(self)
-        # Ukulele tuner
-        self.ukulele_frame = UkuleleFrame(self)
+        # tuner frames by instrument name, built on first display (see draw_tuner_frame)
+        self.tuner_frames = {}
         self.settings_frame = SettingsFrame(self)
 
-        self.curr_frame = "guitar"
+        self.instrument = INSTRUMENTS[0]
+        self.tuner_frame = None
+        self.current_frame = None
+
+        # all strings at once instead of the single pitch (see toggle_polyphonic)
+        self.polyphonic = False
 
-        self.audio_analyzer = AudioAnalyzer(self.frequency_queue)
+        # redraws are triggered by the analyzer thread (see notify_new_frequency)
+        self.redraw_pending = False
+        self.last_redraw_time = 0
+        self.notify_time = None     # first wakeup since the last redraw
+        self.redraw_due = 0         # when the pending redraw should run
+        self.deadline_missed = False
+        self.bind("<<NewFrequency>>", self.on_new_frequency)
+
+        # the thread must not keep the app alive, a wakeup may still be pending on exit
+        self.audio_analyzer = AudioAnalyzer(self.frequency_queue, strings_queue=self.strings_queue, daemon=True)
         self.audio_analyzer.start()
 
-        self.timer = Timer(Settings.FPS)
+        # GUI timings (process, ui_update) next to the analyzer ones
+        self.ui_stages = StageTimer(registry, "ui.")
+        self.metrics_overlay_time = 0
+        self.metrics_dumper = None
+        if Settings.METRICS_DUMP_PATH is not None:
+            self.metrics_dumper = MetricsDumper(registry, Settings.METRICS_DUMP_PATH, Settings.METRICS_DUMP_INTERVAL)
+            self.metrics_dumper.start()
 
-        self.needle_buffer_array = np.zeros(Settings.NEEDLE_BUFFER_LENGTH)
         self.tone_hit_counter = 0
-        self.note_number_counter = 0
-        self.nearest_note_number_buffered = 69
+        self.last_view = None  # held while there is no signal
         self.a4_frequency = 440
+        # note frequencies of the current A4, recomputed when the setting changes
+        self.note_table = NoteTable(self.a4_frequency)
+        # smoothed pitch and note of the needle
+        self.pitch_tracker = PitchTracker(self.note_table)
 
         self.dark_mode_active = False
 
@@ -111,11 +137,10 @@ class App(tkinter.Tk):
         elif "win" in sys.platform:  # Windows
             self.bind("<Alt-Key-F4>", self.on_closing)
 
-        self.draw_main_frame()
-
         if self.read_user_setting("ukulele") is True:
-            self.main_frame.button_inst.set_pressed(True)
-            self.draw_ukulele_frame()
+            self.draw_tuner_frame(get_instrument("ukulele"))
+        else:
+            self.draw_tuner_frame(INSTRUMENTS[0])
 
         self.open_app_time = time.time()
 
@@ -124,40 +149,60 @@ class App(tkinter.Tk):
         tkinter.messagebox.showinfo(title=Settings.APP_NAME,
                                     message=Settings.ABOUT_TEXT)
 
+    def show_frame(self, frame):
+        """
+        Replacing the displayed frame.
+        """
+        if self.current_frame is not None and self.current_frame is not frame:
+            self.current_frame.place_forget()
+        self.current_frame = frame
+        frame.place(relx=0, rely=0, relheight=1, relwidth=1)
+
     def draw_settings_frame(self):
         """
         Displaying settings frame.
         """
-        if self.curr_frame == "guitar":
-            self.settings_frame.prev_frame = "guitar"
-            self.main_frame.place_forget()
-        else:
-            self.settings_frame.prev_frame = "ukulele"
-            self.ukulele_frame.place_forget()
-        self.curr_frame = "settings"
-        self.settings_frame.place(relx=0, rely=0, relheight=1, relwidth=1)
+        self.show_frame(self.settings_frame)
 
-    def draw_main_frame(self):
+    def draw_tuner_frame(self, instrument=None):
         """
-        Displaying guitar frame.
+        Displaying the tuner frame of an instrument (the current one by default).
         """
-        if self.curr_frame == "settings":
-            self.settings_frame.place_forget()
-        else:
-            self.ukulele_frame.place_forget()
-        self.curr_frame = "guitar"
-        self.main_frame.place(relx=0, rely=0, relheight=1, relwidth=1)
+        if instrument is None:
+            instrument = self.instrument
+
+        tuner_frame = self.tuner_frames.get(instrument.name)
+        if tuner_frame is None:
+            tuner_frame = self.tuner_frames[instrument.name] = TunerFrame(self, instrument)
+            tuner_frame.update_color()
+
+        self.instrument = instrument
+        self.tuner_frame = tuner_frame
+        self.audio_analyzer.set_pitch_range(*instrument.pitch_range)
+        self.update_polyphonic()
+        tuner_frame.set_polyphonic(self.polyphonic)
+        tuner_frame.on_show()
+        self.show_frame(tuner_frame)
+
+    def draw_next_instrument(self):
+        """
+        Switching to the tuner frame of the next instrument.
+        """
+        self.draw_tuner_frame(next_instrument(self.instrument))
 
-    def draw_ukulele_frame(self):
+    def toggle_polyphonic(self):
         """
-        Displaying ukulele frame.
+        Switching between the single pitch and all strings of the tuning at once.
         """
-        if self.curr_frame == "settings":
-            self.settings_frame.place_forget()
-        else:
-            self.main_frame.place_forget()
-        self.curr_frame = "ukulele"
-        self.ukulele_frame.place(relx=0, rely=0, relheight=1, relwidth=1)
+        self.polyphonic = not self.polyphonic
+        self.update_polyphonic()
+        self.tuner_frame.set_polyphonic(self.polyphonic)
+
+    def update_polyphonic(self):
+        """
+        Sending the polyphonic mode (with the current tuning and the note table) to the analyzer.
+        """
+        self.audio_analyzer.set_polyphonic(self.instrument.tuning if self.polyphonic else None, self.note_table)
 
     def write_user_setting(self, setting, value):
         with open(self.main_path + Settings.USER_SETTINGS_PATH, "r") as file:
@@ -179,10 +224,13 @@ class App(tkinter.Tk):
         Handle closing app.
         """
         self.audio_analyzer.running = False
+        if self.metrics_dumper is not None:
+            self.metrics_dumper.stop()
         self.destroy()
 
     def update_color(self):
-        self.main_frame.update_color()
+        for tuner_frame in self.tuner_frames.values():
+            tuner_frame.update_color()
         self.settings_frame.update_color()
 
     def handle_appearance_mode(self, mode):
@@ -196,9 +244,162 @@ class App(tkinter.Tk):
 
         self.update_color()
 
+    def update_metrics_overlay(self):
+        """
+        Refreshing the debug overlay of the settings frame, at most every METRICS_OVERLAY_INTERVAL secs.
+        """
+        if not Settings.METRICS_OVERLAY or self.current_frame is not self.settings_frame:
+            return
+        if time.time() - self.metrics_overlay_time >= Settings.METRICS_OVERLAY_INTERVAL:
+            self.metrics_overlay_time = time.time()
+            self.settings_frame.set_metrics_text(registry.format_summary(separator="  "))
+
+    def notify_new_frequency(self):
+        """
+        Called by the analyzer thread after every new result, wakes up the Tk event loop.
+        """
+        if self.notify_time is None:
+            self.notify_time = time.perf_counter()
+        try:
+            self.event_generate("<<NewFrequency>>", when="tail")
+        except (RuntimeError, tkinter.TclError):
+            # the main loop is not running (yet or anymore)
+            pass
+
+    def on_new_frequency(self, event=None):
+        """
+        Scheduling a redraw for a new result, at most Settings.FPS redraws per second.
+        Results that arrive before the redraw are handled by that redraw. A pending
+        redraw that is more than a frame late counts as a missed deadline.
+        """
+        now = time.perf_counter()
+        if self.redraw_pending:
+            if now - self.redraw_due > 1 / Settings.FPS and not self.deadline_missed:
+                self.deadline_missed = True
+                registry.increment("ui.missed_deadlines")
+            return
+        self.redraw_pending = True
+        self.deadline_missed = False
+        notify_time = self.notify_time if self.notify_time is not None else now
+        self.redraw_due = max(self.last_redraw_time + 1 / Settings.FPS, notify_time)
+        self.after(int(max(self.redraw_due - now, 0) * 1000), self.redraw)
+
+    def redraw(self):
+        """
+        Handling all frequencies in the queue and displaying the newest state.
+        """
+        self.redraw_pending = False
+        self.last_redraw_time = time.perf_counter()
+        self.notify_time = None
+        self.ui_stages.start()
+
+        # time from the wakeup of the analyzer (or the FPS limit) to the redraw
+        lateness = self.last_redraw_time - self.redraw_due
+        registry.record("ui.lateness", lateness)
+        if lateness > 1 / Settings.FPS and not self.deadline_missed:
+            registry.increment("ui.missed_deadlines")
+
+        try:
+            # the note table and the combs of the polyphonic mode follow the A4 setting
+            if self.note_table.set_a4_frequency(self.a4_frequency) and self.polyphonic:
+                self.update_polyphonic()
+
+            view = None
+            freq = self.frequency_queue.get()
+            while freq is not None:
+                view = self.process_frequency(freq) or view
+                freq = self.frequency_queue.get()
+
+            # only the newest result of the polyphonic mode is displayed
+            strings_view = None
+            cents = self.strings_queue.get()
+            while cents is not None:
+                strings_view = self.process_strings(cents)
+                cents = self.strings_queue.get()
+            self.ui_stages.lap("process")
+
+            if view is not None:
+                self.show(view)
+            if strings_view is not None and self.current_frame is self.tuner_frame:
+                self.tuner_frame.renderer.render_strings(strings_view)
+            self.update_metrics_overlay()
+            self.ui_stages.lap("ui_update")
+
+        except IOError as err:
+            sys.stderr.write(f'Error: Line {sys.exc_info()[-1].tb_lineno} {type(err).__name__} {err}\n')
+
+    def process_frequency(self, freq):
+        """
+        Tracking a new frequency (see PitchTracker). Returns the values to display.
+        Without a signal (NO_SIGNAL) the last note is held and the frequency is shown
+        as unknown.
+        """
+        tracked_freq = self.pitch_tracker.update(freq)
+        if not tracked_freq > 0:
+            self.tone_hit_counter = 0
+            if self.last_view is None:
+                return None
+            self.last_view = dict(self.last_view, needle_color="red", frequency=None)
+            return self.last_view
+
+        # tracked note (with hysteresis) and its frequency, a lookup in the note table
+        note_number = self.pitch_tracker.note
+        note_freq = self.note_table.frequency(note_number)
+
+        # calculate frequency difference from the tracked frequency to the note
+        freq_difference = note_freq - tracked_freq
+
+        # calculate the angle of the display needle, +-50 cents are +-90 degrees
+        diff_cents = self.pitch_tracker.cents
+        needle_angle = max(-90.0, min(90.0, diff_cents * 1.8))
+
+        # if needle in range +-5 degrees then make it green, otherwise red
+        if abs(freq_difference) < 0.25:
+            needle_color = "green"
+            self.tone_hit_counter += 1
+        else:
+            needle_color = "red"
+            self.tone_hit_counter = 0
+
+        # after 7 hits of the right note in a row play the sound
+        if self.tone_hit_counter > 7:
+            self.tone_hit_counter = 0
+
+        freq_label_text = f"+{round(diff_cents, 1)} cents" if diff_cents > 0 else f"{round(diff_cents, 1)} cents"
+
+        self.last_view = {"needle_color": needle_color,
+                          "needle_angle": needle_angle,
+                          "note_name": NOTE_NAMES[note_number % 12],
+                          "note_name_lower": NOTE_NAMES[(note_number - 1) % 12],
+                          "note_name_higher": NOTE_NAMES[(note_number + 1) % 12],
+                          "frequency_difference": freq_label_text,
+                          "frequency": tracked_freq}
+        return self.last_view
+
+    def process_strings(self, cents):
+        """
+        Returns the (text, color) of every string of the strip view for the cents of
+        the polyphonic mode, green if the string is in tune.
+        """
+        strings = []
+        for string, string_cents in zip(self.instrument.tuning.strings, cents.tolist()):
+            if np.isnan(string_cents):
+                strings.append((string + "\n-", "red"))
+            else:
+                color = "green" if abs(string_cents) < Settings.STRING_IN_TUNE_CENTS else "red"
+                strings.append((f"{string}\n{string_cents:+.0f}", color))
+        return strings
+
+    def show(self, view):
+        """
+        Displaying the values of process_frequency() on the current tuner frame.
+        """
+        if self.current_frame is self.tuner_frame:
+            self.tuner_frame.renderer.render(view)
+
     def start(self):
         """
-        Starting the app.
+        Starting the app. The Tk main loop sleeps until the analyzer publishes a new result.
         """
         self.handle_appearance_mode("Dark")
 
@@ -207,96 +408,10 @@ class App(tkinter.Tk):
             # generate random id
             self.write_user_setting("id", random.randint(10**20, (10**21)-1))
 
-        while self.audio_analyzer.running:
-            try:
-                # get the current frequency from the queue
-                freq = self.frequency_queue.get()
-                if freq is not None:
-
-                    # convert frequency to note number
-                    number = self.audio_analyzer.frequency_to_number(freq, self.a4_frequency)
-
-                    # calculate nearest note number, name and frequency
-                    nearest_note_number = round(number)
-                    nearest_note_freq = self.audio_analyzer.number_to_frequency(nearest_note_number, self.a4_frequency)
-
-                    # calculate frequency difference from freq to nearest note
-                    freq_difference = nearest_note_freq - freq
-
-                    # calculate the frequency difference to the next note (-1)
-                    semitone_step = nearest_note_freq - self.audio_analyzer.number_to_frequency(round(number-1),
-                                                                                                self.a4_frequency)
-
-                    # calculate the angle of the display needle
-                    needle_angle = -90 * ((freq_difference / semitone_step) * 2)
-
-                    # buffer the current nearest note number change
-                    if nearest_note_number != self.nearest_note_number_buffered:
-                        self.note_number_counter += 1
-                        if self.note_number_counter >= Settings.HITS_TILL_NOTE_NUMBER_UPDATE:
-                            self.nearest_note_number_buffered = nearest_note_number
-                            self.note_number_counter = 0
-
-                    # if needle in range +-5 degrees then make it green, otherwise red
-                    if abs(freq_difference) < 0.25:
-                        if self.curr_frame == "guitar":
-                            self.main_frame.set_needle_color("green")
-                        else:
-                            self.ukulele_frame.set_needle_color("green")
-                        self.tone_hit_counter += 1
-                    else:
-                        if self.curr_frame == "guitar":
-                            self.main_frame.set_needle_color("red")
-                        else:
-                            self.ukulele_frame.set_needle_color("red")
-                        self.tone_hit_counter = 0
-
-                    # after 7 hits of the right note in a row play the sound
-                    if self.tone_hit_counter > 7:
-                        self.tone_hit_counter = 0
-
-                    # update needle buffer array
-                    self.needle_buffer_array[:-1] = self.needle_buffer_array[1:]
-                    self.needle_buffer_array[-1:] = needle_angle
-
-                    # update ui note labels and display needle
-                    if self.curr_frame == "guitar":
-                        self.main_frame.set_needle_angle(np.average(self.needle_buffer_array))
-                        self.main_frame.set_note_names(note_name=self.audio_analyzer.number_to_note_name(self.nearest_note_number_buffered),
-                                                    note_name_lower=self.audio_analyzer.number_to_note_name(self.nearest_note_number_buffered - 1),
-                                                    note_name_higher=self.audio_analyzer.number_to_note_name(self.nearest_note_number_buffered + 1))
-                    else:
-                        self.ukulele_frame.set_needle_angle(np.average(self.needle_buffer_array))
-                        self.ukulele_frame.set_note_names(note_name=self.audio_analyzer.number_to_note_name(self.nearest_note_number_buffered),
-                                                    note_name_lower=self.audio_analyzer.number_to_note_name(self.nearest_note_number_buffered - 1),
-                                                    note_name_higher=self.audio_analyzer.number_to_note_name(self.nearest_note_number_buffered + 1))
-
-
-                    # calculate difference in cents
-                    if semitone_step == 0:
-                        diff_cents = 0
-                    else:
-                        diff_cents = (freq_difference / semitone_step) * 100
-                    freq_label_text = f"+{round(-diff_cents, 1)} cents" if -diff_cents > 0 else f"{round(-diff_cents, 1)} cents"
-                    if self.curr_frame == "guitar":
-                        self.main_frame.set_frequency_difference(freq_label_text)
-                    else:
-                        self.ukulele_frame.set_frequency_difference(freq_label_text)
-
-                    # set current frequency
-                    if freq is not None:
-                        if self.curr_frame == "guitar":
-                            self.main_frame.set_frequency(freq)
-                        else:
-                            self.ukulele_frame.set_frequency(freq)
-
-                self.update()
-                self.timer.wait()
-
-            except IOError as err:
-                sys.stderr.write(f'Error: Line {sys.exc_info()[-1].tb_lineno} {type(err).__name__} {err}\n')
-                self.update()
-                self.timer.wait()
+        # the analyzer only wakes up the loop once it runs, before that results just queue up
+        self.audio_analyzer.on_result = self.notify_new_frequency
+        self.after_idle(self.on_new_frequency)
+        self.mainloop()
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ class Settings:
 
     SOURCE_GITHUB_URL_README = "https://github.com/TomSchimansky/GuitarTuner#readme"
     USER_SETTINGS_PATH = "/assets/user_settings/user_settings.json"
+    USER_TUNINGS_PATH = "/assets/user_settings/tunings.json"  # custom tunings, see load_user_tunings()
 
     ABOUT_TEXT = f"{APP_NAME} for Linear Algebra Course Project {YEAR}"
 
@@ -20,10 +21,17 @@ class Settings:
     MAX_WIDTH = 600
     MAX_HEIGHT = 500
 
-    # canvas update rate
+    # maximum canvas update rate, the canvas is only redrawn for new results
     FPS = 60
     # size of the audio-display
     CANVAS_SIZE = 300
 
-    NEEDLE_BUFFER_LENGTH = 30
-    HITS_TILL_NOTE_NUMBER_UPDATE = 15
+    # strings of the polyphonic mode within this many cents of their target are shown green
+    STRING_IN_TUNE_CENTS = 5
+
+    # metrics (see tuner_audio/metrics.py): debug overlay in the settings frame and
+    # periodic JSON dump (None - no dump)
+    METRICS_OVERLAY = False
+    METRICS_OVERLAY_INTERVAL = 0.5  # secs
+    METRICS_DUMP_PATH = None        # e.g. "metrics.json"
+    METRICS_DUMP_INTERVAL = 10      # secs
@@ -0,0 +1,69 @@
+"""
+AudioAnalyzer runs on synthetic signals (python -m pytest).
+"""
+import numpy as np
+import pytest
+
+from tuner_audio.audio_analyzer import AudioAnalyzer
+from tuner_audio.audio_source import ArraySource
+from tuner_audio.benchmark import synthesize
+from tuner_audio.threading_helper import RingQueue
+
+
+def analyze(samples, pitch_range=None, **options):
+    """
+    Runs an AudioAnalyzer on the samples in the current thread, returns the published frequencies.
+    """
+    queue = RingQueue(1000)
+    analyzer = AudioAnalyzer(queue, source=ArraySource(samples), **options)
+    if pitch_range is not None:
+        analyzer.set_pitch_range(*pitch_range)
+    analyzer.run()
+
+    frequencies = []
+    frequency = queue.get()
+    while frequency is not None:
+        frequencies.append(frequency)
+        frequency = queue.get()
+    return [frequency for frequency in frequencies if frequency == frequency]
+
+
+def cents(frequency, target):
+    return 1200 * np.log2(frequency / target)
+
+
+def test_default_analyzer_publishes():
+    frequencies = analyze(synthesize("pluck", 110.0, duration=2))
+    assert frequencies
+    assert abs(cents(np.median(frequencies[-10:]), 110.0)) < 5
+
+
+@pytest.mark.parametrize("pitch_range, frequency", [
+    ((65, 370), 82.41), ((65, 370), 146.83), ((65, 370), 196.0), ((65, 370), 329.63),
+    ((180, 500), 392.0), ((180, 500), 261.63), ((180, 500), 440.0),
+])
+def test_auto_decimation_accuracy(pitch_range, frequency):
+    frequencies = analyze(synthesize("pluck", frequency, duration=2), pitch_range, decimation="auto", gate=False)
+    assert abs(cents(np.median(frequencies[-10:]), frequency)) < 5
+
+
+def test_vectorized_conversions_match_the_scalar_wrappers():
+    frequencies = np.array([27.5, 82.41, 110.0, 261.63, 440.0, 445.0, 3951.07])
+    numbers = AudioAnalyzer.frequencies_to_numbers(frequencies, 440)
+    assert numbers.tolist() == [AudioAnalyzer.frequency_to_number(frequency, 440) for frequency in frequencies]
+    np.testing.assert_allclose(AudioAnalyzer.numbers_to_frequencies(numbers, 440), frequencies)
+    assert AudioAnalyzer.numbers_to_frequencies(numbers, 440).tolist() == \
+        [AudioAnalyzer.number_to_frequency(number, 440) for number in numbers]
+
+    notes = AudioAnalyzer.analyze_frequencies(frequencies, 440)
+    assert AudioAnalyzer.note_names(notes) == ["A0", "E2", "A2", "C4", "A4", "A4", "B7"]
+    assert [AudioAnalyzer.NOTE_NAMES[index] for index in notes["name_index"]] == \
+        [AudioAnalyzer.frequency_to_note_name(frequency, 440) for frequency in frequencies]
+    assert notes["cents"][5] == pytest.approx(1200 * np.log2(445 / 440))
+
+
+def test_invalid_frequencies_are_not_valid():
+    notes = AudioAnalyzer.analyze_frequencies([0.0, -5.0, np.inf, np.nan, 440.0], 432)
+    assert notes["valid"].tolist() == [False, False, False, False, True]
+    assert np.isnan(notes["number"][:4]).all()
+    assert AudioAnalyzer.note_names(notes) == ["", "", "", "", "A4"]
@@ -0,0 +1,22 @@
+"""
+Autocorrelation modes against the direct sum (python -m pytest).
+"""
+import numpy as np
+import pytest
+
+from tuner_audio.autocorrelation import AutocorrelationEngine
+
+
+@pytest.mark.parametrize("mode", ["fft", "incremental"])
+def test_modes_match_direct(mode):
+    hop, window, bounds = 500, 2000, (18, 1999)
+    signal = np.random.default_rng(0).normal(0, 1000, 20 * hop)
+    engine = AutocorrelationEngine(mode, hop=hop)
+    direct = AutocorrelationEngine("direct")
+
+    # a buffer of 2 * window + 1 samples shifted by one hop per update
+    for start in range(0, len(signal) - 2 * window - 1, hop):
+        buffer = signal[start:start + 2 * window + 1]
+        expected = direct.compute(buffer, window, 1, bounds)
+        np.testing.assert_allclose(engine.compute(buffer, window, 1, bounds), expected,
+                                   atol=1e-6 * np.max(np.abs(expected)))
@@ -0,0 +1,38 @@
+"""
+FFT backends against numpy.fft (python -m pytest).
+"""
+import numpy as np
+import pytest
+
+from tuner_audio.audio_analyzer import AudioAnalyzer
+from tuner_audio.fft_backends import FFT_BACKENDS, Radix2FFTBackend, get_fft_backend
+
+
+@pytest.mark.parametrize("size", [2, 4, 64, 1024, 4096])
+def test_radix2_rfft_matches_numpy(size):
+    x = np.random.default_rng(size).standard_normal(size)
+    backend = Radix2FFTBackend()
+    np.testing.assert_allclose(backend.rfft(x), np.fft.rfft(x), atol=1e-9)
+
+    # the preallocated output and the work buffers are reused
+    out = np.empty(size // 2 + 1, dtype=complex)
+    assert backend.rfft(x, out=out) is out
+    np.testing.assert_allclose(backend.rfft(2 * x, out=out), np.fft.rfft(2 * x), atol=1e-9)
+
+
+def test_radix2_complex_fft_matches_numpy():
+    x = np.random.default_rng(1).standard_normal(256)
+    np.testing.assert_allclose(Radix2FFTBackend().fft(x), np.fft.fft(x), atol=1e-9)
+    np.testing.assert_allclose(AudioAnalyzer.fft(x), np.fft.fft(x), atol=1e-9)
+
+
+@pytest.mark.parametrize("size", [3, 100, 3000])
+def test_radix2_rejects_other_sizes(size):
+    with pytest.raises(ValueError, match=str(size)):
+        Radix2FFTBackend().rfft(np.zeros(size))
+
+
+@pytest.mark.parametrize("name", list(FFT_BACKENDS))
+def test_backends_agree(name):
+    x = np.random.default_rng(2).standard_normal(2048)
+    np.testing.assert_allclose(get_fft_backend(name).rfft(x), np.fft.rfft(x), atol=1e-9)
@@ -0,0 +1,28 @@
+"""
+HopSplitter on reads of mixed lengths (python -m pytest).
+"""
+import numpy as np
+
+from tuner_audio.hop_splitter import HopSplitter
+
+
+def test_hops_of_mixed_reads():
+    splitter = HopSplitter(4)
+    stream = np.arange(30, dtype=float)
+    hops = []
+    start = 0
+    for size in (3, 5, 1, 7, 4, 0, 10):
+        hops.extend(hop.copy() for hop in splitter.hops(stream[start:start + size]))
+        start += size
+    assert len(hops) == 7
+    np.testing.assert_array_equal(np.concatenate(hops), stream[:28])
+    assert splitter.filled == 2
+
+
+def test_reset_drops_the_remainder():
+    splitter = HopSplitter(4)
+    assert not list(splitter.hops(np.ones(3)))
+    splitter.reset()
+    hops = list(splitter.hops(np.arange(4.0)))
+    assert len(hops) == 1
+    np.testing.assert_array_equal(hops[0], np.arange(4.0))
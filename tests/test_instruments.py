@@ -0,0 +1,62 @@
+"""
+Instrument and tuning lookups (python -m pytest).
+"""
+import json
+
+import numpy as np
+import pytest
+
+from tuner_audio import instruments
+from tuner_audio.instruments import Tuning, get_instrument, load_user_tunings, next_instrument
+from tuner_audio.note_table import NoteTable
+
+
+def test_tuning_frequencies_follow_the_note_table():
+    tuning = get_instrument("guitar").tunings["standard"]
+    table = NoteTable()
+    tuning.update(table)
+    np.testing.assert_allclose(tuning.frequencies, [82.41, 110.0, 146.83, 196.0, 246.94, 329.63], atol=0.01)
+
+    table.set_a4_frequency(432)
+    tuning.update(table)
+    assert tuning.frequencies[1] == pytest.approx(108.0)
+
+
+def test_nearest_string_of_a_reentrant_tuning():
+    tuning = Tuning("standard", ("G4", "C4", "E4", "A4"))
+    tuning.update(NoteTable())
+    # C4 261.6, E4 329.6, G4 392.0, A4 440.0
+    frequencies = [200.0, 290.0, 300.0, 350.0, 370.0, 430.0, 1000.0]
+    expected = [1, 1, 2, 2, 0, 3, 3]
+    assert [tuning.nearest_string(frequency) for frequency in frequencies] == expected
+    assert tuning.nearest_strings(np.array(frequencies)).tolist() == expected
+
+
+def test_instrument_lookups():
+    guitar = get_instrument("guitar")
+    assert guitar.pitch_range == (65, 370)
+    assert get_instrument("bass").pitch_range == (round(440 * 2 ** ((23 - 4 - 69) / 12)),
+                                                  round(440 * 2 ** ((43 + 4 - 69) / 12)))
+    assert next_instrument(guitar).name == "ukulele"
+    assert next_instrument(get_instrument("ukulele")).name == "guitar"
+    # instruments without a picture continue with the first shown one
+    assert next_instrument(get_instrument("violin")).name == "guitar"
+    with pytest.raises(ValueError):
+        get_instrument("theremin")
+    with pytest.raises(ValueError):
+        guitar.set_tuning("open_x")
+
+
+def test_load_user_tunings(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(instruments, "INSTRUMENTS", list(instruments.INSTRUMENTS))
+    path = tmp_path / "tunings.json"
+    path.write_text(json.dumps([{"instrument": "bouzouki", "name": "standard", "strings": ["G2", "D3", "A3", "D4"],
+                                 "pitch_range": [90, 330]},
+                                {"instrument": "bouzouki", "name": "broken", "strings": ["X9"]}]))
+
+    assert load_user_tunings(str(path)) == 1
+    assert "Invalid tuning" in capsys.readouterr().err
+    bouzouki = get_instrument("bouzouki")
+    assert bouzouki.pitch_range == (90, 330)
+    assert bouzouki.tuning.strings == ("G2", "D3", "A3", "D4")
+    assert load_user_tunings(str(tmp_path / "missing.json")) == 0
@@ -0,0 +1,57 @@
+"""
+NoteTable lookups against the formulas (python -m pytest).
+"""
+import numpy as np
+import pytest
+
+from tuner_audio.note_table import NoteTable, note_name_to_number, note_number_to_name
+
+
+@pytest.mark.parametrize("a4_frequency", [440, 432, 446.5])
+def test_number_matches_the_formula(a4_frequency):
+    table = NoteTable(a4_frequency)
+    frequencies = np.geomspace(20, 5000, 2001)
+    numbers = [table.number(frequency) for frequency in frequencies]
+    expected = 12 * np.log2(frequencies / a4_frequency) + 69
+    # below 0.001 cents
+    np.testing.assert_allclose(numbers, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("a4_frequency", [440, 432])
+def test_fractional_frequency_matches_the_formula(a4_frequency):
+    table = NoteTable(a4_frequency)
+    numbers = np.linspace(10, 120, 1001)
+    frequencies = [table.fractional_frequency(number) for number in numbers]
+    np.testing.assert_allclose(frequencies, a4_frequency * 2 ** ((numbers - 69) / 12), rtol=1e-8)
+    assert table.number(table.fractional_frequency(45.678)) == pytest.approx(45.678, abs=1e-5)
+
+
+def test_integer_frequencies_and_a4_change():
+    table = NoteTable()
+    assert table.frequency(69) == 440
+    assert table.frequency(57) == pytest.approx(220)
+    assert table.frequency(-12) == pytest.approx(440 * 2 ** (-81 / 12))
+    assert not table.set_a4_frequency(440)
+    assert table.set_a4_frequency(442)
+    assert table.frequency(69) == 442
+    assert table.number(442) == pytest.approx(69)
+
+
+def test_out_of_range_is_clipped():
+    table = NoteTable()
+    assert table.number(1.0) == table.first_cent
+    assert table.number(1e6) == table.HIGHEST_NUMBER + 0.5
+    assert table.fractional_frequency(-10) == table.cent_list[0]
+    assert table.fractional_frequency(500) == table.cent_list[-1]
+
+
+@pytest.mark.parametrize("name, number", [("A4", 69), ("C#3", 49), ("Bb1", 34), ("E2", 40), ("C-1", 0)])
+def test_note_names(name, number):
+    assert note_name_to_number(name) == number
+    if "b" not in name:
+        assert note_number_to_name(number) == name
+
+
+def test_invalid_note_name():
+    with pytest.raises(ValueError):
+        note_name_to_number("H2")
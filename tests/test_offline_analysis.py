@@ -0,0 +1,55 @@
+"""
+Offline and batch analysis of WAV files (python -m pytest).
+"""
+import io
+import json
+import wave
+
+import numpy as np
+import pytest
+
+from tuner_audio.audio_source import AudioSourceError
+from tuner_audio.batch_analysis import load_finished_files
+from tuner_audio.benchmark import synthesize
+from tuner_audio.offline_analysis import analyze_wav, write_json
+
+SAMPLE_RATE = 48000
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(SAMPLE_RATE)
+        file.writeframes(samples.astype("<i2").tobytes())
+
+
+def test_write_json(tmp_path):
+    path = tmp_path / "tone.wav"
+    write_wav(path, synthesize("pluck", 110.0, duration=2, sample_rate=SAMPLE_RATE))
+    output = io.StringIO()
+    write_json(analyze_wav(str(path)), output)
+    rows = json.loads(output.getvalue())
+    assert rows and rows[-1]["note"] == "A2"
+
+    output = io.StringIO()
+    write_json([], output)
+    assert json.loads(output.getvalue()) == []
+
+
+def test_write_json_of_a_missing_file(tmp_path):
+    output = io.StringIO()
+    with pytest.raises(AudioSourceError):
+        write_json(analyze_wav(str(tmp_path / "missing.wav")), output)
+    assert output.getvalue() == ""
+
+
+def test_resume_retries_errors(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text(json.dumps({"file": "a.wav", "frames": []}) + "\n"
+                    + json.dumps({"file": "b.wav", "error": "AudioSourceError Can not open b.wav"}) + "\n"
+                    + json.dumps({"file": "c.wav", "frames": []}) + "\n"
+                    + '{"file": "d.wav", "fra')
+
+    assert load_finished_files(str(path)) == {"a.wav", "c.wav"}
+    assert [json.loads(line)["file"] for line in path.read_text().splitlines()] == ["a.wav", "c.wav"]
@@ -0,0 +1,54 @@
+"""
+OnsetDetector on synthetic plucks (python -m pytest).
+"""
+import numpy as np
+
+from tuner_audio.benchmark import synthesize
+from tuner_audio.onset import OnsetDetector
+
+SAMPLE_RATE = 48000
+CHUNK_SIZE = 3000
+
+
+def plucks(frequencies, chunks):
+    """
+    One pluck of `chunks` chunks per frequency.
+    """
+    duration = chunks * CHUNK_SIZE / SAMPLE_RATE
+    return np.concatenate([synthesize("pluck", frequency, duration, SAMPLE_RATE, seed=index)
+                           for index, frequency in enumerate(frequencies)])
+
+
+def test_plucks_are_found():
+    detector = OnsetDetector(CHUNK_SIZE)
+    signal = plucks((82.41, 110.0, 146.83), 24)
+    onsets = [index for index in range(len(signal) // CHUNK_SIZE)
+              if detector.process(signal[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE])]
+    assert onsets == [0, 24, 48]
+
+
+def test_pluck_after_silence():
+    detector = OnsetDetector(CHUNK_SIZE)
+    signal = np.concatenate((np.zeros(8 * CHUNK_SIZE), plucks((196.0,), 8)))
+    onsets = [index for index in range(len(signal) // CHUNK_SIZE)
+              if detector.process(signal[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE])]
+    assert onsets == [8]
+
+
+def test_read_of_several_hops():
+    detector = OnsetDetector(CHUNK_SIZE)
+    signal = plucks((82.41, 110.0), 6)
+    assert detector.process(signal[:4 * CHUNK_SIZE])
+    assert not detector.process(signal[4 * CHUNK_SIZE:5 * CHUNK_SIZE])
+    # the pluck in the middle of a read is not missed
+    assert detector.process(signal[5 * CHUNK_SIZE:8 * CHUNK_SIZE].astype(np.int16))
+
+
+def test_reads_shorter_than_a_hop():
+    detector = OnsetDetector(CHUNK_SIZE)
+    signal = plucks((82.41, 110.0), 24)
+    size = CHUNK_SIZE // 2
+    onsets = [index for index in range(len(signal) // size)
+              if detector.process(signal[index * size:(index + 1) * size])]
+    # the read that completes the first hop of every pluck
+    assert onsets == [1, 49]
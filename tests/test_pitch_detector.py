@@ -0,0 +1,24 @@
+"""
+PitchDetector on synthetic signals (python -m pytest).
+"""
+import numpy as np
+import pytest
+
+from tuner_audio.benchmark import synthesize
+from tuner_audio.pitch_detector import PitchDetector
+
+
+@pytest.mark.parametrize("sample_rate", [48000, 44100, 22050, 8000])
+def test_default_range_at_any_sample_rate(sample_rate):
+    detector = PitchDetector(sample_rate=sample_rate)
+    min_frequency, max_frequency = detector.default_pitch_range()
+    assert min_frequency == pytest.approx(PitchDetector.ACF_MIN_FREQUENCY, rel=0.01)
+    assert max_frequency == pytest.approx(PitchDetector.ACF_MAX_FREQUENCY, rel=0.02)
+
+    # the buffer is full after BUFFER_CHUNKS chunks
+    chunk_size = detector.chunk_size
+    duration = (PitchDetector.BUFFER_CHUNKS + 4) * chunk_size / sample_rate
+    samples = synthesize("pluck", 146.83, duration=duration, sample_rate=sample_rate)
+    for start in range(0, len(samples) - chunk_size + 1, chunk_size):
+        frequency, _ = detector.process(samples[start:start + chunk_size])
+    assert abs(1200 * np.log2(frequency / 146.83)) < 5
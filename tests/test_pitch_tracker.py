@@ -0,0 +1,32 @@
+"""
+PitchTracker on synthetic frequency streams (python -m pytest).
+"""
+import numpy as np
+
+from tuner_audio.note_table import NoteTable
+from tuner_audio.pitch_tracker import PitchTracker
+
+
+def test_outliers_and_note_changes():
+    tracker = PitchTracker(NoteTable(440))
+    for frequency in [110.0] * 10 + [220.0] + [110.0] * 5:
+        tracked = tracker.update(frequency)
+    assert abs(1200 * np.log2(tracked / 110.0)) < 1
+    assert tracker.note == 45
+
+    # a new note after two agreeing readings
+    tracker.update(146.83)
+    assert tracker.update(146.83) == tracker.frequency
+    assert tracker.note == 50
+    assert np.isnan(tracker.update(float("nan")))
+    assert tracker.note is None
+
+
+def test_a4_change_resets():
+    note_table = NoteTable(440)
+    tracker = PitchTracker(note_table)
+    tracker.update(440.0)
+    note_table.set_a4_frequency(432)
+    tracker.update(432.0)
+    assert tracker.note == 69
+    assert abs(tracker.cents) < 1e-6
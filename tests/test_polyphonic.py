@@ -0,0 +1,27 @@
+"""
+PolyphonicDetector on a synthetic strum (python -m pytest).
+"""
+import numpy as np
+
+from tuner_audio.benchmark import synthesize
+from tuner_audio.instruments import get_instrument
+from tuner_audio.note_table import NoteTable
+from tuner_audio.polyphonic import PolyphonicDetector
+
+SAMPLE_RATE = 8000
+CHUNK_SIZE = 500
+
+
+def strum(tuning, duration):
+    return sum(synthesize("pluck", 440 * 2 ** ((number - 69) / 12), duration, SAMPLE_RATE, seed=number)
+               for number in tuning.numbers)
+
+
+def test_read_longer_than_the_buffer():
+    tuning = get_instrument("guitar").tunings["standard"]
+    detector = PolyphonicDetector(SAMPLE_RATE, CHUNK_SIZE)
+    detector.set_tuning(tuning, NoteTable())
+
+    samples = strum(tuning, 2 * detector.buffer_length / SAMPLE_RATE)
+    cents, _ = detector.process(samples)
+    assert np.all(np.abs(cents) < 5)
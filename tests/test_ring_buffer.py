@@ -0,0 +1,41 @@
+"""
+RingBuffer wrap-around (python -m pytest).
+"""
+import numpy as np
+
+from tuner_audio.ring_buffer import RingBuffer
+
+
+def test_wrap_around_keeps_the_newest_samples():
+    buffer = RingBuffer(8)
+    stream = np.arange(1, 31, dtype=float)
+    start = 0
+    for size in (3, 5, 6, 1, 7, 8):
+        buffer.write(stream[start:start + size])
+        start += size
+        expected = np.concatenate((np.zeros(8), stream[:start]))[-8:]
+        np.testing.assert_array_equal(buffer.view(), expected)
+        np.testing.assert_array_equal(buffer.latest(3), expected[-3:])
+
+
+def test_write_longer_than_the_buffer():
+    buffer = RingBuffer(4)
+    buffer.write(np.arange(3.0))
+    buffer.write(np.arange(10.0, 20.0))
+    np.testing.assert_array_equal(buffer.view(), [16, 17, 18, 19])
+
+
+def test_view_is_read_only_and_clear():
+    buffer = RingBuffer(4)
+    buffer.write(np.ones(6))
+    assert not buffer.view().flags.writeable
+    buffer.clear()
+    np.testing.assert_array_equal(buffer.view(), np.zeros(4))
+
+
+def test_apply_window_leaves_the_padding():
+    buffer = RingBuffer(4)
+    buffer.write(np.arange(1.0, 7.0))
+    out = np.zeros(8)
+    buffer.apply_window(np.full(4, 0.5), out)
+    np.testing.assert_array_equal(out, [1.5, 2, 2.5, 3, 0, 0, 0, 0])
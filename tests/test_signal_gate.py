@@ -0,0 +1,49 @@
+"""
+SignalGate on synthetic chunks (python -m pytest).
+"""
+import numpy as np
+
+from tuner_audio.benchmark import synthesize
+from tuner_audio.signal_gate import SignalGate
+
+SAMPLE_RATE = 48000
+CHUNK_SIZE = 3000
+
+
+def tone(chunks):
+    return synthesize("tone", 110.0, duration=chunks * CHUNK_SIZE / SAMPLE_RATE, sample_rate=SAMPLE_RATE)
+
+
+def noise(num_samples, seed=0):
+    return np.random.default_rng(seed).normal(0, 5, num_samples)
+
+
+def test_tone_opens_and_noise_closes():
+    gate = SignalGate(SAMPLE_RATE, CHUNK_SIZE)
+    assert gate.process(tone(1))
+    for seed in range(gate.hold_chunks + 1):
+        is_open = gate.process(noise(CHUNK_SIZE, seed=seed))
+    assert not is_open
+
+
+def test_silence_stays_closed():
+    gate = SignalGate(SAMPLE_RATE, CHUNK_SIZE)
+    assert not any(gate.process(np.zeros(CHUNK_SIZE, dtype=np.int16)) for _ in range(4))
+    assert gate.noise_floor == gate.min_rms
+
+
+def test_read_of_several_hops():
+    gate = SignalGate(SAMPLE_RATE, CHUNK_SIZE)
+    assert gate.process(tone(2).astype(np.int16))
+    assert not gate.process(noise(8 * CHUNK_SIZE))
+    # the newest hop decides
+    assert gate.process(np.concatenate((noise(4 * CHUNK_SIZE), tone(1))))
+
+
+def test_reads_shorter_than_a_hop():
+    gate = SignalGate(SAMPLE_RATE, CHUNK_SIZE)
+    signal = tone(1)
+    # the first hop is only complete after the third read
+    assert [gate.process(signal[start:start + 1000]) for start in range(0, CHUNK_SIZE, 1000)] == [False, False, True]
+    # a read that completes no hop keeps the decision
+    assert gate.process(noise(500))
@@ -0,0 +1,76 @@
+"""
+RingQueue policies and a producer/consumer run (python -m pytest).
+"""
+from threading import Thread
+
+import pytest
+
+from tuner_audio.threading_helper import ProtectedList, RingQueue
+
+
+def drain(queue):
+    elements = []
+    element = queue.get()
+    while element is not None:
+        elements.append(element)
+        element = queue.get()
+    return elements
+
+
+def test_drop_oldest_overwrites():
+    queue = RingQueue(4)
+    for element in range(10):
+        assert queue.put(element)
+    assert len(queue) == 4
+    assert drain(queue) == [6, 7, 8, 9]
+    assert queue.overflows == 6
+    assert queue.dropped == 6
+
+
+def test_block_times_out_when_full():
+    queue = RingQueue(2, policy=RingQueue.BLOCK)
+    assert queue.put(1) and queue.put(2)
+    assert not queue.put(3, timeout=0.01)
+    assert queue.overflows == 1
+    assert drain(queue) == [1, 2]
+    assert queue.dropped == 0
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        RingQueue(4, policy="drop_newest")
+
+
+def test_protected_list_drops_the_oldest():
+    queue = ProtectedList(3)
+    for element in range(5):
+        queue.put(element)
+    assert drain(queue) == [2, 3, 4]
+
+
+@pytest.mark.parametrize("policy", [RingQueue.DROP_OLDEST, RingQueue.BLOCK])
+def test_producer_consumer(policy):
+    queue = RingQueue(8, policy=policy)
+    count = 20000
+
+    def produce():
+        for element in range(count):
+            queue.put(element)
+        queue.put(-1)
+
+    producer = Thread(target=produce)
+    producer.start()
+    received = []
+    element = queue.get(block=True, timeout=5)
+    while element is not None and element != -1:
+        received.append(element)
+        element = queue.get(block=True, timeout=5)
+    producer.join()
+
+    assert element == -1
+    # the order is kept, only the "drop_oldest" policy loses entries
+    assert received == sorted(set(received))
+    if policy == RingQueue.BLOCK:
+        assert received == list(range(count))
+    else:
+        assert len(received) + queue.dropped == count
@@ -0,0 +1,38 @@
+"""
+YinDetector accuracy on synthetic signals (python -m pytest).
+"""
+import numpy as np
+import pytest
+
+from tuner_audio.benchmark import synthesize
+from tuner_audio.yin import YinDetector
+
+
+def cents(frequency, target):
+    return 1200 * np.log2(frequency / target)
+
+
+@pytest.mark.parametrize("sample_rate", [48000, 8000])
+@pytest.mark.parametrize("kind", ["pluck", "tone", "noise_20db"])
+@pytest.mark.parametrize("frequency", [82.41, 146.83, 329.63, 440.0])
+def test_accuracy(sample_rate, kind, frequency):
+    detector = YinDetector(sample_rate, window=sample_rate // 10)
+    samples = synthesize(kind, frequency, duration=0.5, sample_rate=sample_rate)
+    detected, confidence = detector.detect(samples)
+    assert abs(cents(detected, frequency)) < 5
+    assert confidence > 0.8
+
+
+def test_lag_bounds_restrict_the_search():
+    sample_rate = 48000
+    detector = YinDetector(sample_rate, window=4800)
+    samples = synthesize("pluck", 110.0, duration=0.5, sample_rate=sample_rate)
+    # only lags of 330 - 660 Hz: the second and higher harmonics are left
+    detected, _ = detector.detect(samples, (int(sample_rate / 660), int(sample_rate / 330)))
+    assert not abs(cents(detected, 110.0)) < 50
+
+
+def test_silence_has_no_confidence():
+    detector = YinDetector(48000, window=4800)
+    _, confidence = detector.detect(np.zeros(detector.signal_length))
+    assert confidence == 0
@@ -11,17 +11,8 @@ class ImageManager:
     def __init__(self, main_path):
         # Image.LANCZOS -> a high-quality downsampling filter.
 
-        self.guitar_image = ImageTk.PhotoImage(
-            Image.open(main_path + "/assets/images/guitar.png").resize((50, 50), Image.LANCZOS))
-
-        self.guitar_hovered_image = ImageTk.PhotoImage(
-            Image.open(main_path + "/assets/images/ukulele.png").resize((50, 50), Image.LANCZOS))
-
-        self.ukulele_image = ImageTk.PhotoImage(
-            Image.open(main_path + "/assets/images/ukulele.png").resize((50, 50), Image.LANCZOS))
-
-        self.ukulele_hovered_image = ImageTk.PhotoImage(
-            Image.open(main_path + "/assets/images/guitar.png").resize((50, 50), Image.LANCZOS))
+        self.main_path = main_path
+        self.instrument_images = {}
 
         self.arrowUp_image = ImageTk.PhotoImage(
             Image.open(main_path + "/assets/images/arrowUp.png").resize((147, 46), Image.LANCZOS))
@@ -34,3 +25,12 @@ class ImageManager:
 
         self.arrowDown_image_hovered = ImageTk.PhotoImage(
             Image.open(main_path + "/assets/images/arrowDown_hovered.png").resize((147, 46), Image.LANCZOS))
+
+    def get_instrument_image(self, name):
+        """
+        Returns the picture of an instrument (assets/images/<name>.png), loaded on first use.
+        """
+        if name not in self.instrument_images:
+            self.instrument_images[name] = ImageTk.PhotoImage(
+                Image.open(self.main_path + f"/assets/images/{name}.png").resize((50, 50), Image.LANCZOS))
+        return self.instrument_images[name]
@@ -3,58 +3,192 @@ Analysing input signal.
 """
 import sys
 import copy
-from threading import Thread
-from pyaudio import PyAudio, paInt16
+from threading import Lock, Thread
 import numpy as np
-from scipy.fft import fft as scipy_fft
+
+from tuner_audio.fft_backends import Radix2FFTBackend
+from tuner_audio.pitch_detector import PitchDetector
+from tuner_audio.audio_source import AudioSourceError, PyAudioCallbackSource, PyAudioSource
+from tuner_audio.decimation import PolyphaseDecimator, decimation_factor
+from tuner_audio.metrics import StageTimer, registry
+from tuner_audio.note_table import NOTE_NAMES, NoteTable
+from tuner_audio.onset import OnsetDetector
+from tuner_audio.polyphonic import PolyphonicDetector
+from tuner_audio.signal_gate import SignalGate
 
 # CONSTANTS
-# (One of 2 methods: FFT or AUTOCORR should be enabled!)
-DEBUGGING_EN = False
+# (One of 2 methods: FFT or AUTOCORR should be enabled!
+#  Both can also be chosen per instance with AudioAnalyzer(method=...).)
 FFT_EN = False
 AUTOCORR_EN = True
+# Non-blocking microphone capture with a PyAudio stream callback (latest window wins)
+CALLBACK_CAPTURE_EN = True
+# Anti-aliased decimation in front of the detector: "auto" (factor chosen by the pitch
+# range of the instrument), a fixed factor, or 1 (off)
+DECIMATION = "auto"
+# skipping the detection on quiet and noisy chunks (see SignalGate)
+GATE_EN = True
+# shorter analysis window right after a pluck, growing while the note sustains (see OnsetDetector)
+ONSET_EN = True
+# results with a lower confidence (0 - 1) are not published, e.g. while the buffer fills
+MIN_CONFIDENCE = 0.5
+
+# put into the queue once when the signal stops (the gate closes)
+NO_SIGNAL = float("nan")
+
+# backend of AudioAnalyzer.fft(), its work buffers are allocated once per size
+RADIX2_FFT = Radix2FFTBackend()
 
 
 class AudioAnalyzer(Thread):
     """
-    AudioAnalyzer reads the microphone and finds the frequency of the loudest tone.
+    AudioAnalyzer reads an AudioSource (the microphone by default) in a thread and
+    puts the frequency of the loudest tone, found by a PitchDetector, into a queue.
     To use it, you also need the ProtectedList class from the file threading_helper.py.
     You need to created an instance of the ProtectedList, which acts as a queue, and you
     have to pass this queue to the AudioAnalyzer.
     """
 
-    SAMPLING_RATE = 48000              # sample frequency in Hz
-    CHUNK_SIZE = 3000                  # number of samples
-    BUFFER_LENGTH = CHUNK_SIZE * 16    # window size in samples
-    NUM_HPS = 5                        # HPS (Harmonic Product Spectrum)
-    WHITE_NOISE_THRESH = 0.2   # values under WHITE_NOISE_THRESH*avg_energy_per_freq is cut off
+    SAMPLING_RATE = PitchDetector.SAMPLING_RATE    # sample frequency in Hz
+    CHUNK_SIZE = PitchDetector.CHUNK_SIZE          # number of samples
+    BUFFER_LENGTH = PitchDetector.BUFFER_LENGTH    # window size in samples
+    NUM_HPS = PitchDetector.NUM_HPS                # HPS (Harmonic Product Spectrum)
 
     #              buffer length in seconds:  BUFFER_LENGTH / SAMPLING_RATE sec
     # length between two samples in seconds:  1 / SAMPLING_RATE sec
     DELTA_FREQ = SAMPLING_RATE / BUFFER_LENGTH
     OCTAVE_BANDS = [50, 100, 200, 400, 800, 1600, 3200, 6400, 12800, 25600]
 
-    NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+    NOTE_NAMES = NOTE_NAMES
 
-    def __init__(self, queue, *args, **kwargs):
+    def __init__(self, queue, *args, source=None, detector=None, acf_mode="fft", fft_backend="numpy",
+                 method=None, callback_capture=CALLBACK_CAPTURE_EN, peak_refinement="phase",
+                 decimation=DECIMATION, metrics=None, on_result=None, strings_queue=None, gate=GATE_EN,
+                 onsets=ONSET_EN, min_confidence=MIN_CONFIDENCE, **kwargs):
         Thread.__init__(self, *args, **kwargs)
 
         self.queue = queue  # instance of ProtectedList
-        self.buffer = np.zeros(self.BUFFER_LENGTH)
-        self.hanning_window = np.hanning(self.BUFFER_LENGTH)
+        self.strings_queue = strings_queue  # results of the polyphonic mode (cents of every string)
         self.running = False
+        self.on_result = on_result  # called (in this thread) after every result put into the queue
 
-        try:
-            self.audio_object = PyAudio()
-            self.stream = self.audio_object.open(format=paInt16,
-                                                 channels=1,
-                                                 rate=self.SAMPLING_RATE,
-                                                 input=True,
-                                                 output=False,
-                                                 frames_per_buffer=self.CHUNK_SIZE)
-        except Exception as e:
-            sys.stderr.write(f'Error: Line {sys.exc_info()[-1].tb_lineno} {type(e).__name__} {e}\n')
-            return
+        # stage timings (read, decimate, detect, queue_put) and counters, see tuner_audio.metrics
+        self.metrics = metrics if metrics is not None else registry
+        self.stages = StageTimer(self.metrics, "analyzer.")
+
+        # the microphone is opened if no other source is given
+        self.source = source
+        if self.source is None:
+            try:
+                if callback_capture:
+                    self.source = PyAudioCallbackSource(self.SAMPLING_RATE, self.CHUNK_SIZE,
+                                                        capacity=self.BUFFER_LENGTH)
+                else:
+                    self.source = PyAudioSource(self.SAMPLING_RATE, self.CHUNK_SIZE)
+            except AudioSourceError as e:
+                sys.stderr.write(f'Error: {e}\n')
+
+        self.input_rate = self.source.sample_rate if self.source is not None else self.SAMPLING_RATE
+        self.input_chunk_size = self.source.chunk_size if self.source is not None else self.CHUNK_SIZE
+
+        # the decimator is only used with a detector built here, which knows the reduced rate
+        self.decimation = decimation
+        self.decimator = None
+        self.detector_options = None
+        if detector is None:
+            # "fft", "autocorr" or "yin", by default taken from FFT_EN / AUTOCORR_EN
+            method = method if method is not None else ("fft" if FFT_EN else "autocorr")
+            self.detector_options = {"method": method, "acf_mode": acf_mode, "fft_backend": fft_backend,
+                                     "peak_refinement": peak_refinement, "metrics": self.metrics}
+            detector = self.build_detector(1 if decimation == "auto" else decimation)
+        self.detector = detector
+
+        # chunks below the adaptive noise floor or with a flat spectrum are not analysed
+        self.gate = SignalGate(self.input_rate, self.input_chunk_size) if gate else None
+        self.min_confidence = min_confidence
+        # a new pluck restarts the detector with a short window (see PitchDetector.onset())
+        self.onset_detector = OnsetDetector(self.input_chunk_size) if onsets else None
+        self.detecting = False  # the detectors got chunks since the last reset
+        self.signal = False     # the last published result was a frequency
+
+        self.metrics.gauge("queue.overflows", lambda: self.queue.overflows)
+        self.metrics.gauge("queue.dropped", lambda: self.queue.dropped)
+        self.metrics.gauge("capture", self.capture_stats)
+        if self.gate is not None:
+            self.metrics.gauge("gate", lambda: {"closed_chunks": self.gate.closed_chunks,
+                                                "noise_floor": round(self.gate.noise_floor, 1)})
+        if self.onset_detector is not None:
+            self.metrics.gauge("onsets", lambda: self.onset_detector.onsets)
+
+        # pitch range and polyphonic mode requested by the GUI thread, applied by the analyzer thread
+        self.pitch_range_lock = Lock()
+        self.pending_pitch_range = None
+        self.pending_polyphonic = None
+
+        # polyphonic mode (see set_polyphonic), the detector is built by the analyzer thread
+        self.polyphonic = None
+        self.polyphonic_settings = (None, None)
+        self.note_table = NoteTable()  # 440 Hz, for a polyphonic mode without a table
+
+    @staticmethod
+    def frequencies_to_numbers(frequencies, a4_freq):
+        """
+        Converting an array of frequencies to note numbers. For example: 440 is 69 (A4).
+        Zero, negative, infinite and NaN frequencies give NaN.
+        """
+        frequencies = np.asarray(frequencies, dtype=float)
+        numbers = np.full(frequencies.shape, np.nan)
+        np.log2(frequencies / a4_freq, out=numbers, where=(frequencies > 0) & (frequencies < np.inf))
+        numbers *= 12
+        numbers += 69
+        return numbers
+
+    @staticmethod
+    def numbers_to_frequencies(numbers, a4_freq):
+        """
+        Converting an array of note numbers to frequencies. For example: 69 is 440 (A4).
+        """
+        return a4_freq * 2.0 ** ((np.asarray(numbers, dtype=float) - 69) / 12)
+
+    @staticmethod
+    def numbers_to_name_indices(numbers):
+        """
+        Returns the indices in NOTE_NAMES of the nearest notes of an array of note numbers, 0 for NaN.
+        """
+        numbers = np.asarray(numbers, dtype=float)
+        nearest = np.rint(np.where(np.isfinite(numbers), numbers, 0))
+        return nearest.astype(np.int64) % 12
+
+    @staticmethod
+    def analyze_frequencies(frequencies, a4_freq):
+        """
+        The whole conversion chain for an array of frequencies, as a dict of arrays:
+        - valid: True for positive frequencies, the other entries are only meaningful there,
+        - number: note number (NaN if not valid),
+        - nearest: nearest note number,
+        - cents: cents from the nearest note, -50 to +50 (NaN if not valid),
+        - octave: octave of the nearest note (A4 is in octave 4),
+        - name_index: index of the name of the nearest note in NOTE_NAMES.
+        """
+        numbers = AudioAnalyzer.frequencies_to_numbers(frequencies, a4_freq)
+        valid = ~np.isnan(numbers)
+
+        nearest = np.rint(np.where(valid, numbers, 0)).astype(np.int64)
+        return {"valid": valid,
+                "number": numbers,
+                "nearest": nearest,
+                "cents": (numbers - nearest) * 100,
+                "octave": nearest // 12 - 1,
+                "name_index": nearest % 12}
+
+    @staticmethod
+    def note_names(notes):
+        """
+        Returns the names with octave (e.g. 'A4') of the result of analyze_frequencies(), '' if not valid.
+        """
+        return [AudioAnalyzer.NOTE_NAMES[index] + str(octave) if valid else ""
+                for valid, index, octave in zip(notes["valid"].tolist(), notes["name_index"].tolist(),
+                                                notes["octave"].tolist())]
 
     @staticmethod
     def frequency_to_number(freq, a4_freq):
@@ -65,14 +199,14 @@ class AudioAnalyzer(Thread):
             sys.stderr.write("Error: No frequency data. No access to microphone\n")
             return 0
 
-        return 12 * np.log2(freq / a4_freq) + 69
+        return float(AudioAnalyzer.frequencies_to_numbers(freq, a4_freq))
 
     @staticmethod
     def number_to_frequency(number, a4_freq):
         """
         Converting a note number to a frequency. For example: 69 is A4.
         """
-        return a4_freq * 2.0**((number - 69) / 12.0)
+        return float(AudioAnalyzer.numbers_to_frequencies(number, a4_freq))
 
     @staticmethod
     def number_to_note_name(number):
@@ -82,7 +216,7 @@ class AudioAnalyzer(Thread):
         - 70 is 'A#',
         - ...
         """
-        return AudioAnalyzer.NOTE_NAMES[int(round(number) % 12)]
+        return AudioAnalyzer.NOTE_NAMES[int(AudioAnalyzer.numbers_to_name_indices(number))]
 
     @staticmethod
     def frequency_to_note_name(frequency, a4_freq):
@@ -95,20 +229,9 @@ class AudioAnalyzer(Thread):
     @staticmethod
     def fft(x):
         """
-        FFT.
-        https://pythonnumericalmethods.studentorg.berkeley.edu/notebooks/chapter24.03-Fast-Fourier-Transform.html
+        FFT (iterative radix-2, the length of x must be a power of 2).
         """
-        n = len(x)
-        if n == 1:
-            return x
-
-        x_even = AudioAnalyzer.fft(x[::2])
-        x_odd = AudioAnalyzer.fft(x[1::2])
-        factor = np.exp(-2j * np.pi * np.arange(n) / n)
-
-        total = np.concatenate([x_even + factor[:int(n/2)] * x_odd,
-                            x_even + factor[int(n/2):] * x_odd])
-        return total
+        return RADIX2_FFT.fft(x)
 
     @staticmethod
     def acf(f, w, t, lag):
@@ -118,123 +241,211 @@ class AudioAnalyzer(Thread):
         return np.sum(f[t : t + w] * f[lag + t : lag + t + w])
 
     @staticmethod
-    def auto_corr_detect_pitch(f, W, t, sample_rate, bounds):
+    def auto_corr_detect_pitch(f, W, t, sample_rate, bounds, engine=None):
         """
         Detecting pitch in autocorrelation algorithm.
+        If an AutocorrelationEngine is given, all lags are computed in one batch.
         """
-        ACF_vals = [AudioAnalyzer.acf(f, W, t, i) for i in range(*bounds)]
+        if engine is None:
+            ACF_vals = [AudioAnalyzer.acf(f, W, t, i) for i in range(*bounds)]
+        else:
+            ACF_vals = engine.compute(f, W, t, bounds)
         sample = np.argmax(ACF_vals) + bounds[0]
         return sample_rate / sample
 
+    def set_acf_mode(self, mode):
+        """
+        Switching the autocorrelation mode ("direct", "fft" or "incremental") at runtime.
+        """
+        self.detector.set_acf_mode(mode)
+
+    def build_detector(self, factor):
+        """
+        Building the decimator and a detector for the input decimated by `factor` (1 - no decimation).
+        """
+        if self.input_chunk_size % factor:
+            raise ValueError(f"The decimation factor {factor} does not divide the chunk size {self.input_chunk_size}")
+        if self.input_rate % factor:
+            raise ValueError(f"The decimation factor {factor} does not divide the sample rate {self.input_rate}")
+
+        self.decimator = PolyphaseDecimator(factor) if factor > 1 else None
+        return PitchDetector(sample_rate=self.input_rate // factor, chunk_size=self.input_chunk_size // factor,
+                             **self.detector_options)
+
+    def apply_pitch_range(self, min_frequency, max_frequency):
+        """
+        Setting the pitch range of the detector (analyzer thread). With automatic decimation
+        the detector is rebuilt if the range needs another factor.
+        """
+        if self.detector_options is not None and self.decimation == "auto":
+            factor = 1
+            if max_frequency is not None:
+                factor = decimation_factor(self.input_rate, max_frequency, self.input_chunk_size)
+            if factor != (self.decimator.factor if self.decimator is not None else 1):
+                self.detector = self.build_detector(factor)
+
+        self.detector.set_pitch_range(min_frequency, max_frequency)
+
+        # a rebuilt detector may work at another sample rate
+        if self.polyphonic is not None and self.polyphonic.sample_rate != self.detector.sample_rate:
+            self.apply_polyphonic(*self.polyphonic_settings)
+
+    def apply_polyphonic(self, tuning, note_table):
+        """
+        Starting (tuning) or stopping (None) the polyphonic mode (analyzer thread).
+        """
+        self.polyphonic_settings = (tuning, note_table)
+        if tuning is None:
+            self.polyphonic = None
+            return
+
+        if self.polyphonic is None or self.polyphonic.sample_rate != self.detector.sample_rate:
+            self.polyphonic = PolyphonicDetector(self.detector.sample_rate, self.detector.chunk_size)
+        self.polyphonic.set_tuning(tuning, note_table)
+
+    def publish_no_signal(self):
+        """
+        Putting NO_SIGNAL into the queue once when the signal stops.
+        """
+        if not self.signal:
+            return
+        self.signal = False
+        self.queue.put(NO_SIGNAL)
+        if self.on_result is not None and self.running:
+            self.on_result()
+
+    def reset_detection(self):
+        """
+        Clearing the audio history of the decimator and the detectors after a silence,
+        so the next tone is not mixed with the audio before it.
+        """
+        if self.decimator is not None:
+            self.decimator.reset()
+        self.detector.reset()
+        if self.polyphonic is not None:
+            self.polyphonic.reset()
+        if self.onset_detector is not None:
+            self.onset_detector.reset()
+
+    def set_polyphonic(self, tuning=None, note_table=None):
+        """
+        With a Tuning all its strings are detected at once (see PolyphonicDetector): the cents
+        of every string (NaN if it does not sound) are put into the strings queue instead of
+        a frequency into the queue. None switches back to the single pitch. The targets of
+        the strings follow the A4 frequency of `note_table` (440 Hz without one), call it
+        again after a change. The mode is applied by the analyzer thread before the next chunk.
+        """
+        if tuning is not None and self.strings_queue is None:
+            raise ValueError("The polyphonic mode needs a strings queue")
+        if note_table is None:
+            note_table = self.note_table
+        with self.pitch_range_lock:
+            self.pending_polyphonic = (tuning, note_table)
+
+    def set_pitch_range(self, min_frequency=None, max_frequency=None):
+        """
+        Restricting the pitch search to an instrument (see PitchDetector.set_pitch_range()).
+        The range is applied by the analyzer thread before the next chunk.
+        """
+        with self.pitch_range_lock:
+            self.pending_pitch_range = (min_frequency, max_frequency)
+
+    def capture_stats(self):
+        """
+        Returns the overflow and dropped frame counters of the audio source (if it has any).
+        """
+        if hasattr(self.source, "stats"):
+            return self.source.stats()
+        return {}
+
     def run(self):
         """
-        Main function where the microphone buffer gets read and the FFT gets applied.
+        Main function where the audio source gets read and the pitch gets detected.
         """
+        if self.source is None:
+            sys.stderr.write("Error: No audio source, the analyzer is not started\n")
+            return
+
         self.running = True
-        if DEBUGGING_EN:
-            percent_corr = []
 
         while self.running:
             try:
-                # read microphone data
-                data = self.stream.read(self.CHUNK_SIZE, exception_on_overflow=False)
-                data = np.frombuffer(data, dtype=np.int16)
-
-                # append data to audio buffer
-                self.buffer[:-self.CHUNK_SIZE] = self.buffer[self.CHUNK_SIZE:]
-                self.buffer[-self.CHUNK_SIZE:] = data
-
-                if FFT_EN:
-                    # Zero-padding to the nearest power of 2.
-                    # It allows one to use a longer FFT, which will produce a longer
-                    # FFT result vector. A longer FFT result has more frequency bins that are
-                    # more closely spaced in frequency.
-                    nearest_power_of_2 = int(2 ** np.ceil(np.log2(self.BUFFER_LENGTH)))
-
-                    # apply the FFT on the whole buffer (with zero-padding + hanning window)
-                    # - Hanning window helps to control leakage, thereby increasing the dynamic
-                    #   range of the analysis.
-                    magnitude_data = abs(
-                        AudioAnalyzer.fft(np.pad(self.buffer * self.hanning_window,
-                                                (0, nearest_power_of_2 - self.BUFFER_LENGTH),
-                                                "constant")))
-
-                    # ----- Debugging part -----
-                    if DEBUGGING_EN:
-                        nump = abs(np.fft.fft(np.pad(self.buffer * self.hanning_window,
-                                                    (0, nearest_power_of_2 - self.BUFFER_LENGTH),
-                                                    "constant")))
-                        sci = abs(scipy_fft(np.pad(self.buffer * self.hanning_window,
-                                                (0, nearest_power_of_2 - self.BUFFER_LENGTH),
-                                                "constant")))
-
-                        print(f"Raw data:  {data[:6]}")
-                        print(f"Numpy:     {nump[:6]}")
-                        print(f"Scipy:     {sci[:6]}")
-                        print(f"Custom:    {magnitude_data[:6]}")
-
-                        true_values = np.sum(np.isclose(magnitude_data, nump))
-                        percents = round(true_values / len(magnitude_data) * 100, 2)
-                        percent_corr.append(percents)
-                        print(f"FFT calculated for  {len(percent_corr)}  \
-    samples: {round(np.mean(percent_corr), 2)}% of values are close to true (atol 1e-8).")
-
-                    # use only the first half of the FFT output data
-                    magnitude_data = magnitude_data[:len(magnitude_data) // 2]
-
-                    # HPS: multiply data by itself with different scalings (Harmonic Product Spectrum)
-                    magnitude_data_orig = np.copy(magnitude_data)
-                    for i in range(2, self.NUM_HPS + 1):
-                        hps_len = int(np.ceil(len(magnitude_data) / i))
-                        magnitude_data[:hps_len] *= magnitude_data_orig[::i]  # multiply every i element
-
-                    # get the corresponding frequency array
-                    frequencies = np.fft.fftfreq(int((len(magnitude_data) * 2)),
-                                                1. / self.SAMPLING_RATE)
-
-                    # calculate the frequency
-                    # N = len(magnitude_data)
-                    # n = np.arange(N)
-                    # T = N / self.SAMPLING_RATE
-                    # freq1 = n / T
-                    # print(frequencies[:5])
-                    # print(freq1[:5])
-
-                    # set magnitude of all frequencies below 60Hz to zero
-                    for i, freq in enumerate(frequencies):
-                        if freq > 60:
-                            magnitude_data[:i - 1] = 0
-                            break
-
+                self.stages.start()
+                data = self.source.read()
+                if data is None:
+                    break
+                self.stages.lap("read")
+
+                with self.pitch_range_lock:
+                    pitch_range, self.pending_pitch_range = self.pending_pitch_range, None
+                    polyphonic, self.pending_polyphonic = self.pending_polyphonic, None
+                if pitch_range is not None:
+                    self.apply_pitch_range(*pitch_range)
+                if polyphonic is not None:
+                    self.apply_polyphonic(*polyphonic)
+
+                # without a signal only the RMS of the chunk is computed
+                if self.gate is not None and not self.gate.process(data):
+                    self.stages.lap("gate")
+                    if self.detecting:
+                        self.detecting = False
+                        self.reset_detection()
+                    self.publish_no_signal()
+                    continue
+                self.detecting = True
+                self.stages.lap("gate")
+
+                if self.onset_detector is not None:
+                    if self.onset_detector.process(data):
+                        self.detector.onset()
+                    self.stages.lap("onset")
+
+                if self.decimator is not None:
+                    data = self.decimator.process(data)
+                    self.stages.lap("decimate")
+
+                if self.polyphonic is not None:
+                    # put the cents of every string into the strings queue
+                    cents, _ = self.polyphonic.process(data)
+                    self.stages.lap("polyphonic")
+                    self.strings_queue.put(cents)
+                    self.signal = True
+                else:
                     # put the frequency of the loudest tone into the queue
-                    self.queue.put(round(frequencies[np.argmax(magnitude_data)], 2))
-
-                if AUTOCORR_EN:
-                    self.queue.put(round(AudioAnalyzer.auto_corr_detect_pitch(self.buffer, self.BUFFER_LENGTH // 2,
-                                                                    1, self.SAMPLING_RATE, [109, len(data) // 2]), 2))
+                    frequency, confidence = self.detector.process(data)
+                    self.stages.lap("detect")
+                    if confidence < self.min_confidence:
+                        self.publish_no_signal()
+                        continue
+                    self.queue.put(round(frequency, 2))
+                    self.signal = True
+                self.stages.lap("queue_put")
+
+                if self.on_result is not None and self.running:
+                    self.on_result()
 
             except Exception as e:
+                self.metrics.increment("analyzer.errors")
                 sys.stderr.write(f'Error: Line {sys.exc_info()[-1].tb_lineno} {type(e).__name__} {e}\n')
 
-        self.stream.stop_stream()
-        self.stream.close()
-        self.audio_object.terminate()
+        self.running = False
+        self.source.close()
 
 
 if __name__ == "__main__":
-    # Testing:
-    from threading_helper import ProtectedList
+    # Testing (python -m tuner_audio.audio_analyzer):
+    from tuner_audio.threading_helper import ProtectedList
     import time
 
-    DEBUGGING_EN = False
-
     q = ProtectedList()
     a = AudioAnalyzer(q)
     a.start()
 
     while True:
         q_data = q.get()
-        if q_data is not None:
+        if q_data is not None and np.isnan(q_data):
+            print("No signal")
+        elif q_data is not None:
             print(f"""Loudest frequency: {q_data:7.2f}\t\
 Nearest note: {a.frequency_to_note_name(q_data, 440)}""")
             time.sleep(0.01)
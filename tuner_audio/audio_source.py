@@ -0,0 +1,301 @@
+"""
+Audio sources that deliver chunks of samples to a PitchDetector.
+"""
+import wave
+from abc import ABC, abstractmethod
+from threading import Event
+
+import numpy as np
+
+
+class AudioSourceError(Exception):
+    """
+    Raised when an audio source can not be opened.
+    """
+
+
+class AudioSource(ABC):
+    """
+    Interface of an audio source.
+    read() returns the next chunk of mono samples (in the int16 range) as a numpy
+    array, or None when the source is exhausted. close() releases the source.
+    """
+
+    sample_rate = None
+    chunk_size = None
+
+    @abstractmethod
+    def read(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        while True:
+            chunk = self.read()
+            if chunk is None:
+                return
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PyAudioSource(AudioSource):
+    """
+    Microphone input with PyAudio (blocking reads).
+    """
+
+    def __init__(self, sample_rate=48000, chunk_size=3000):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+
+        try:
+            from pyaudio import PyAudio, paInt16
+
+            self.audio_object = PyAudio()
+        except Exception as e:
+            raise AudioSourceError(f"PyAudio is not available: {type(e).__name__} {e}") from e
+
+        try:
+            self.stream = self.audio_object.open(format=paInt16,
+                                                 channels=1,
+                                                 rate=self.sample_rate,
+                                                 input=True,
+                                                 output=False,
+                                                 frames_per_buffer=self.chunk_size,
+                                                 **self.stream_options())
+        except Exception as e:
+            self.audio_object.terminate()
+            raise AudioSourceError(f"Can not open the microphone: {type(e).__name__} {e}") from e
+
+    def stream_options(self):
+        """
+        Additional arguments of PyAudio.open().
+        """
+        return {}
+
+    def read(self):
+        data = self.stream.read(self.chunk_size, exception_on_overflow=False)
+        return np.frombuffer(data, dtype=np.int16)
+
+    def close(self):
+        self.stream.stop_stream()
+        self.stream.close()
+        self.audio_object.terminate()
+
+
+class PyAudioCallbackSource(PyAudioSource):
+    """
+    Microphone input with a PyAudio stream callback (non-blocking capture).
+
+    The callback only copies the frames into a preallocated ring of `capacity`
+    samples. read() waits for at least one new hop and returns everything that
+    arrived since the last read (latest wins): the detector analyses the newest
+    window once, so a slow detector never builds up a backlog and the latency
+    stays bounded by one hop.
+
+    Counters:
+    - input_overflows: callbacks flagged with an input overflow by PortAudio,
+    - overruns: samples overwritten in the ring before they were read,
+    - skipped_hops: hops that arrived while the detector was busy and were
+      not analysed on their own.
+    """
+
+    def __init__(self, sample_rate=48000, chunk_size=3000, capacity=None, timeout=1.0):
+        self.capacity = capacity if capacity is not None else chunk_size * 16
+        self.timeout = timeout
+
+        self.ring = np.zeros(self.capacity, dtype=np.int16)
+        self.output = np.zeros(self.capacity, dtype=np.int16)
+        self.written = 0   # samples written by the callback (callback thread)
+        self.consumed = 0  # samples returned by read() (analysis thread)
+        self.data_available = Event()
+
+        self.input_overflows = 0
+        self.overruns = 0
+        self.skipped_hops = 0
+
+        PyAudioSource.__init__(self, sample_rate, chunk_size)
+
+    def stream_options(self):
+        return {"stream_callback": self.callback}
+
+    def callback(self, in_data, frame_count, time_info, status_flags):
+        """
+        PyAudio stream callback, runs in the PortAudio thread.
+        """
+        from pyaudio import paContinue, paInputOverflow
+
+        if status_flags & paInputOverflow:
+            self.input_overflows += 1
+
+        data = np.frombuffer(in_data, dtype=np.int16)
+        start = self.written % self.capacity
+        first = min(len(data), self.capacity - start)
+        self.ring[start:start + first] = data[:first]
+        self.ring[:len(data) - first] = data[first:]
+
+        self.written += len(data)
+        self.data_available.set()
+        return None, paContinue
+
+    def read(self):
+        while self.written - self.consumed < self.chunk_size:
+            self.data_available.clear()
+            if self.written - self.consumed >= self.chunk_size:
+                break
+            if not self.data_available.wait(self.timeout) and not self.stream.is_active():
+                return None
+
+        written = self.written
+        available = written - self.consumed
+        if available > self.capacity:
+            self.overruns += available - self.capacity
+            available = self.capacity
+
+        # whole hops only, everything older than the newest hop was not analysed on its own
+        leftover = available % self.chunk_size
+        available -= leftover
+        self.skipped_hops += available // self.chunk_size - 1
+
+        begin = written - leftover - available
+        start = begin % self.capacity
+        first = min(available, self.capacity - start)
+        self.output[:first] = self.ring[start:start + first]
+        self.output[first:available] = self.ring[:available - first]
+
+        # the callback overwrote the beginning while it was copied
+        if self.written - begin > self.capacity:
+            self.overruns += self.written - begin - self.capacity
+
+        self.consumed = written - leftover
+        return self.output[:available]
+
+    def stats(self):
+        """
+        Returns the capture counters.
+        """
+        return {"input_overflows": self.input_overflows,
+                "overruns": self.overruns,
+                "skipped_hops": self.skipped_hops}
+
+
+def decode_frames(frames, sample_width, channels):
+    """
+    Converts raw PCM frames to mono float samples in the int16 range.
+    """
+    if sample_width == 1:
+        data = (np.frombuffer(frames, dtype=np.uint8).astype(float) - 128) * 256
+    elif sample_width == 2:
+        data = np.frombuffer(frames, dtype="<i2").astype(float)
+    elif sample_width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        data = (raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16))
+        data = np.where(data >= 1 << 23, data - (1 << 24), data).astype(float) / 256
+    elif sample_width == 4:
+        data = np.frombuffer(frames, dtype="<i4").astype(float) / 65536
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width} bytes")
+
+    if channels > 1:
+        data = data.reshape(-1, channels).mean(axis=1)
+    return data
+
+
+class WavFileSource(AudioSource):
+    """
+    PCM WAV file read chunk by chunk with the stdlib wave module.
+    The last chunk is zero-padded to the full chunk size.
+    """
+
+    def __init__(self, path, chunk_size=3000):
+        try:
+            self.wave_file = wave.open(path, "rb")
+        except (OSError, EOFError, wave.Error) as e:
+            raise AudioSourceError(f"Can not open {path}: {type(e).__name__} {e}") from e
+
+        self.sample_rate = self.wave_file.getframerate()
+        self.chunk_size = chunk_size
+        self.sample_width = self.wave_file.getsampwidth()
+        self.channels = self.wave_file.getnchannels()
+        if self.sample_width not in (1, 2, 3, 4):
+            self.wave_file.close()
+            raise AudioSourceError(f"Can not read {path}: unsupported sample width of {self.sample_width} bytes")
+
+    def read(self):
+        frames = self.wave_file.readframes(self.chunk_size)
+        if not frames:
+            return None
+
+        chunk = decode_frames(frames, self.sample_width, self.channels)
+        if len(chunk) < self.chunk_size:
+            chunk = np.pad(chunk, (0, self.chunk_size - len(chunk)), "constant")
+        return chunk
+
+    def close(self):
+        self.wave_file.close()
+
+
+class SineSource(AudioSource):
+    """
+    Synthetic tone: a fundamental with optional harmonics (amplitudes relative to
+    the fundamental) and white noise. Deterministic for a given seed.
+    With duration=None the source never ends.
+    """
+
+    def __init__(self, frequency, sample_rate=48000, chunk_size=3000, amplitude=8000,
+                 harmonics=(), noise=0.0, duration=None, seed=0):
+        self.frequency = frequency
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.amplitude = amplitude
+        self.harmonics = tuple(harmonics)
+        self.noise = noise
+        self.total_samples = None if duration is None else int(duration * sample_rate)
+
+        self.position = 0
+        self.generator = np.random.default_rng(seed)
+
+    def read(self):
+        if self.total_samples is not None and self.position >= self.total_samples:
+            return None
+
+        t = (self.position + np.arange(self.chunk_size)) / self.sample_rate
+        chunk = np.sin(2 * np.pi * self.frequency * t)
+        for number, relative_amplitude in enumerate(self.harmonics, start=2):
+            chunk += relative_amplitude * np.sin(2 * np.pi * self.frequency * number * t)
+        chunk *= self.amplitude
+
+        if self.noise:
+            chunk += self.generator.normal(0, self.noise, self.chunk_size)
+
+        self.position += self.chunk_size
+        return chunk
+
+
+class ArraySource(AudioSource):
+    """
+    In-memory numpy signal, delivered chunk by chunk.
+    The last chunk is zero-padded to the full chunk size.
+    """
+
+    def __init__(self, samples, sample_rate=48000, chunk_size=3000):
+        self.samples = np.asarray(samples)
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    def read(self):
+        if self.position >= len(self.samples):
+            return None
+
+        chunk = self.samples[self.position:self.position + self.chunk_size]
+        self.position += self.chunk_size
+        if len(chunk) < self.chunk_size:
+            chunk = np.pad(chunk, (0, self.chunk_size - len(chunk)), "constant")
+        return chunk
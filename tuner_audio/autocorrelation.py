@@ -0,0 +1,211 @@
+"""
+Autocorrelation engines used by the autocorrelation pitch detector.
+"""
+import numpy as np
+from scipy.fft import next_fast_len
+
+from tuner_audio.fft_backends import NUMPY_RFFT_HAS_OUT, NumpyFFTBackend
+
+
+class AutocorrelationPlan:
+    """
+    Precomputed parameters for computing the autocorrelation of one window
+    over a fixed range of lags with the Wiener-Khinchin theorem.
+
+    The window f[t : t + w] is correlated with the extended segment
+    f[t : t + w + max_lag], so the result is identical to the direct sum
+    used by AudioAnalyzer.acf (no circular wrap-around and no bias).
+    """
+
+    def __init__(self, window, bounds):
+        self.window = window
+        self.min_lag, self.max_lag = bounds
+        self.segment_length = self.window + self.max_lag
+
+        # FFT size must hold the whole extended segment to avoid circular aliasing
+        self.fft_size = next_fast_len(self.segment_length, real=True)
+
+        self.window_buffer = np.zeros(self.fft_size)
+        self.segment_buffer = np.zeros(self.fft_size)
+        self.window_spectrum = np.zeros(self.fft_size // 2 + 1, dtype=complex)
+        self.segment_spectrum = np.zeros(self.fft_size // 2 + 1, dtype=complex)
+        self.correlation = np.zeros(self.fft_size)
+        self.backend = NumpyFFTBackend()
+
+    def compute(self, f, t):
+        """
+        Returns the autocorrelation values for every lag in [min_lag, max_lag).
+        """
+        self.window_buffer[:self.window] = f[t : t + self.window]
+        self.segment_buffer[:self.segment_length] = f[t : t + self.segment_length]
+
+        self.backend.rfft(self.window_buffer, out=self.window_spectrum)
+        self.backend.rfft(self.segment_buffer, out=self.segment_spectrum)
+
+        # cross power spectrum -> correlation in time domain
+        np.conjugate(self.window_spectrum, out=self.window_spectrum)
+        self.segment_spectrum *= self.window_spectrum
+        if NUMPY_RFFT_HAS_OUT:
+            np.fft.irfft(self.segment_spectrum, self.fft_size, out=self.correlation)
+        else:
+            self.correlation[:] = np.fft.irfft(self.segment_spectrum, self.fft_size)
+
+        return self.correlation[self.min_lag:self.max_lag]
+
+
+class SlidingAutocorrelation:
+    """
+    Incremental autocorrelation of a window that slides forward by `hop` samples
+    between two updates.
+
+    The window f[t : t + w] is split into w / hop blocks. The lag-product sums of
+    every block are stored, so an update only computes the block that entered the
+    window and subtracts the block that left it. A block is correlated with an
+    AutocorrelationPlan of the hop size, in its preallocated buffers. Every
+    `resync_interval` updates the running sums are rebuilt from the stored blocks
+    to stop floating-point drift.
+    """
+
+    def __init__(self, window, bounds, hop, resync_interval=64):
+        if window % hop != 0:
+            raise ValueError(f"Window size {window} must be a multiple of the hop size {hop}")
+
+        self.window = window
+        self.min_lag, self.max_lag = bounds
+        self.hop = hop
+        self.resync_interval = resync_interval
+
+        self.num_blocks = self.window // self.hop
+        self.block_plan = AutocorrelationPlan(self.hop, bounds)
+        self.block_sums = np.zeros((self.num_blocks, self.max_lag - self.min_lag))
+        self.running_sums = np.zeros(self.max_lag - self.min_lag)
+        self.oldest_block = 0
+        self.updates_since_resync = 0
+        self.initialized = False
+
+    def reset(self):
+        """
+        Forgetting the stored blocks, the next update recomputes the whole window.
+        """
+        self.initialized = False
+
+    def block_contribution(self, f, start, out):
+        """
+        Lag-product sums of the block f[start : start + hop] for every lag.
+        """
+        out[:] = self.block_plan.compute(f, start)
+
+    def resync(self):
+        """
+        Rebuilding the running sums from the stored blocks.
+        """
+        np.sum(self.block_sums, axis=0, out=self.running_sums)
+        self.updates_since_resync = 0
+
+    def update(self, f, t):
+        """
+        Returns the autocorrelation of f[t : t + window] for every lag in [min_lag, max_lag).
+        Must be called once after every shift of f by `hop` samples.
+        """
+        if not self.initialized:
+            for block in range(self.num_blocks):
+                self.block_contribution(f, t + block * self.hop, self.block_sums[block])
+            self.oldest_block = 0
+            self.initialized = True
+            self.resync()
+            return self.running_sums
+
+        # the oldest block left the window, the newest one entered at its end
+        self.running_sums -= self.block_sums[self.oldest_block]
+        self.block_contribution(f, t + self.window - self.hop, self.block_sums[self.oldest_block])
+        self.running_sums += self.block_sums[self.oldest_block]
+        self.oldest_block = (self.oldest_block + 1) % self.num_blocks
+
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= self.resync_interval:
+            self.resync()
+
+        return self.running_sums
+
+
+class AutocorrelationEngine:
+    """
+    Computes the autocorrelation of a window over a range of lags.
+    Three modes are available:
+    - "direct": one np.sum per lag (reference implementation),
+    - "fft": all lags at once in the frequency domain (Wiener-Khinchin),
+    - "incremental": running lag-product sums updated once per hop. In this mode
+      compute() must be called exactly once after every shift of the signal by `hop`.
+    The mode can be switched at any time with set_mode().
+    """
+
+    MODES = ("direct", "fft", "incremental")
+
+    def __init__(self, mode="fft", hop=None):
+        self.mode = None
+        self.hop = hop
+        self.plans = {}
+        self.sliding = {}
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        """
+        Selecting the autocorrelation mode.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown autocorrelation mode '{mode}', expected one of {self.MODES}")
+        if mode == "incremental" and self.hop is None:
+            raise ValueError("The incremental mode needs the hop size of the signal")
+
+        # sliding state gets stale while another mode is active
+        self.reset()
+        self.mode = mode
+
+    def reset(self):
+        """
+        Forgetting the incremental state, e.g. when a new signal starts.
+        """
+        for sliding in self.sliding.values():
+            sliding.reset()
+
+    def get_plan(self, window, bounds):
+        """
+        Returns a cached plan for the given window size and lag bounds.
+        """
+        key = (window, bounds[0], bounds[1])
+        if key not in self.plans:
+            self.plans[key] = AutocorrelationPlan(window, bounds)
+        return self.plans[key]
+
+    def get_sliding(self, window, bounds):
+        """
+        Returns the sliding autocorrelation state for the given window size and lag bounds.
+        """
+        key = (window, bounds[0], bounds[1])
+        if key not in self.sliding:
+            self.sliding[key] = SlidingAutocorrelation(window, bounds, self.hop)
+        return self.sliding[key]
+
+    @staticmethod
+    def direct(f, w, t, bounds):
+        """
+        Autocorrelation computed lag by lag.
+        """
+        return np.array([np.sum(f[t : t + w] * f[lag + t : lag + t + w]) for lag in range(*bounds)])
+
+    def compute(self, f, w, t, bounds, search=None):
+        """
+        Autocorrelation of f[t : t + w] for every lag in range(*bounds).
+        With `search` (a sub-range of bounds) only the lags in range(*search) are
+        returned: the direct mode computes just those, the other modes keep their
+        plans and sliding state for `bounds` and return a slice.
+        """
+        if search is None:
+            search = bounds
+        start, stop = search[0] - bounds[0], search[1] - bounds[0]
+
+        if self.mode == "fft":
+            return self.get_plan(w, tuple(bounds)).compute(f, t)[start:stop]
+        if self.mode == "incremental":
+            return self.get_sliding(w, tuple(bounds)).update(f, t)[start:stop]
+        return self.direct(f, w, t, search)
@@ -0,0 +1,124 @@
+"""
+Parallel pitch analysis of many WAV files with a process pool.
+"""
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from tuner_audio.audio_source import WavFileSource
+from tuner_audio.offline_analysis import analyze_source
+from tuner_audio.pitch_detector import PitchDetector
+from tuner_audio.note_table import NoteTable
+from tuner_audio.pitch_tracker import PitchTracker
+
+# per worker process state, created once by init_worker()
+worker_settings = {}
+worker_detectors = {}
+
+
+def init_worker(method, a4_frequency, track=False):
+    """
+    Initializer of every worker process.
+    """
+    worker_settings["method"] = method
+    worker_settings["a4_frequency"] = a4_frequency
+    worker_settings["track"] = track
+    worker_detectors.clear()
+
+
+def get_worker_detector(sample_rate):
+    """
+    Returns the pitch detector of this worker for a sample rate. Windows, FFT plans and
+    buffers are built once and reused for every file with that sample rate.
+    """
+    if sample_rate not in worker_detectors:
+        worker_detectors[sample_rate] = PitchDetector(worker_settings["method"], sample_rate=sample_rate)
+    detector = worker_detectors[sample_rate]
+    detector.reset()
+    return detector
+
+
+def analyze_file(path):
+    """
+    Analysing one file in a worker process. Errors are reported in the result.
+    """
+    try:
+        with WavFileSource(path, PitchDetector.CHUNK_SIZE) as source:
+            detector = get_worker_detector(source.sample_rate)
+            tracker = None
+            if worker_settings["track"]:
+                tracker = PitchTracker(NoteTable(worker_settings["a4_frequency"]))
+            frames = list(analyze_source(source, detector, worker_settings["a4_frequency"], tracker=tracker))
+        return {"file": path, "frames": frames}
+    except Exception as e:
+        return {"file": path, "error": f"{type(e).__name__} {e}"}
+
+
+def find_wav_files(directory):
+    """
+    Returns all WAV files below a directory, sorted.
+    """
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.lower().endswith(".wav"):
+                files.append(os.path.join(root, name))
+    return sorted(files)
+
+
+def load_finished_files(output_path):
+    """
+    Reads a partial results file (JSON lines) and returns the files that were analysed.
+    Files with an error are removed from the file, so they are analysed again, and so is
+    a truncated last line, e.g. from an interrupted run.
+    """
+    if not os.path.exists(output_path):
+        return set()
+
+    finished = set()
+    valid_lines = []
+    with open(output_path) as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if "error" in result:
+                continue
+            finished.add(result["file"])
+            valid_lines.append(line if line.endswith("\n") else line + "\n")
+
+    with open(output_path, "w") as file:
+        file.writelines(valid_lines)
+    return finished
+
+
+def run_batch(directory, output_path, method="autocorr", a4_frequency=440, workers=None,
+              resume=False, track=False, progress=sys.stderr):
+    """
+    Analyses every WAV file below `directory` on all cores and writes one JSON line
+    per file to `output_path`, in the sorted order of the files.
+    With resume=True the files already analysed in `output_path` are skipped (files
+    with an error are tried again), with track=True the frequencies are smoothed by
+    a PitchTracker.
+    Returns the number of analysed files.
+    """
+    files = find_wav_files(directory)
+    finished = load_finished_files(output_path) if resume else set()
+    pending = [path for path in files if path not in finished]
+
+    with open(output_path, "a" if resume else "w") as output, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                initargs=(method, a4_frequency, track)) as executor:
+
+        # map() returns the results in the order of the files
+        for index, result in enumerate(executor.map(analyze_file, pending, chunksize=4)):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+            if progress is not None:
+                status = "error" if "error" in result else f"{len(result['frames'])} frames"
+                progress.write(f"[{len(finished) + index + 1}/{len(files)}] {result['file']} ({status})\n")
+
+    return len(pending)
@@ -0,0 +1,238 @@
+"""
+Reproducible benchmark of the pitch detection pipeline on synthetic signals.
+
+Usage:
+    python3 tuner_cli.py benchmark --output benchmark.json
+    python3 -m tuner_audio.benchmark
+"""
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from tuner_audio.decimation import PolyphaseDecimator
+from tuner_audio.instruments import get_instrument
+from tuner_audio.pitch_detector import PitchDetector
+
+SAMPLE_RATE = PitchDetector.SAMPLING_RATE
+CHUNK_SIZE = PitchDetector.CHUNK_SIZE
+DURATION = 3                          # seconds per signal
+AMPLITUDE = 8000                      # peak amplitude (int16 range)
+PITCH_RANGE = get_instrument("guitar").pitch_range  # as set by the GUI
+FREQUENCIES = (82.41, 110.0, 146.83, 196.0, 246.94, 329.63)  # guitar strings, standard tuning
+GROSS_ERROR_CENTS = 50                # errors above this are counted as wrong notes
+
+# options of the detection pipeline, see build_pipeline()
+DEFAULT_CONFIGURATION = {"method": "autocorr", "buffer_chunks": None, "num_hps": PitchDetector.NUM_HPS,
+                         "acf_mode": "fft", "peak_refinement": "phase", "decimation": 1}
+
+CONFIGURATIONS = [
+    {"method": "autocorr"},
+    {"method": "autocorr", "acf_mode": "incremental"},
+    {"method": "autocorr", "decimation": 6},
+    {"method": "fft", "peak_refinement": "none", "buffer_chunks": 16},
+    {"method": "fft", "buffer_chunks": 2},
+    {"method": "fft"},
+    {"method": "fft", "buffer_chunks": 8},
+    {"method": "fft", "num_hps": 3},
+    {"method": "fft", "num_hps": 7},
+    {"method": "fft", "decimation": 6},
+    {"method": "yin", "buffer_chunks": 2},
+    {"method": "yin"},
+    {"method": "yin", "decimation": 6},
+]
+
+
+def synthesize(kind, frequency, duration=DURATION, sample_rate=SAMPLE_RATE, seed=0):
+    """
+    Synthetic test signal with a known fundamental:
+    - "tone": pure sine,
+    - "pluck": 10 harmonics with random phases, the higher ones decaying faster,
+    - "noise_<snr>db": 5 harmonics with white noise at the given SNR,
+    - "decay": sine with an exponential envelope (time constant 0.8 s).
+    """
+    generator = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+
+    if kind == "tone":
+        signal = np.sin(2 * np.pi * frequency * t)
+    elif kind == "pluck":
+        signal = np.zeros(len(t))
+        for number in range(1, 11):
+            if number * frequency < sample_rate / 2:
+                phase = generator.uniform(0, 2 * np.pi)
+                signal += np.sin(2 * np.pi * frequency * number * t + phase) * np.exp(-t * (1 + number) / 2) / number
+    elif kind.startswith("noise_"):
+        snr = float(kind[len("noise_"):-len("db")])
+        signal = sum(np.sin(2 * np.pi * frequency * number * t) / number for number in range(1, 6))
+        noise_power = np.mean(signal ** 2) / 10 ** (snr / 10)
+        signal = signal + generator.normal(0, np.sqrt(noise_power), len(t))
+    elif kind == "decay":
+        signal = np.sin(2 * np.pi * frequency * t) * np.exp(-t / 0.8)
+    else:
+        raise ValueError(f"Unknown signal kind '{kind}'")
+
+    return AMPLITUDE * signal / np.max(np.abs(signal))
+
+
+SIGNALS = ("tone", "pluck", "noise_20db", "noise_10db", "noise_0db", "decay")
+
+
+def build_pipeline(configuration):
+    """
+    Returns the decimator (or None) and the pitch detector of a configuration,
+    the same pipeline that AudioAnalyzer.run() feeds.
+    """
+    options = dict(DEFAULT_CONFIGURATION, **configuration)
+    factor = options["decimation"]
+    chunk_size = CHUNK_SIZE // factor
+
+    buffer_length = None
+    if options["buffer_chunks"] is not None:
+        buffer_length = chunk_size * options["buffer_chunks"]
+
+    detector = PitchDetector(options["method"], sample_rate=SAMPLE_RATE // factor, chunk_size=chunk_size,
+                             buffer_length=buffer_length, num_hps=options["num_hps"],
+                             acf_mode=options["acf_mode"], peak_refinement=options["peak_refinement"])
+    detector.set_pitch_range(*PITCH_RANGE)
+    return (PolyphaseDecimator(factor) if factor > 1 else None), detector
+
+
+def run_signal(decimator, detector, samples, trace_allocations=False):
+    """
+    Feeds a signal chunk by chunk through the pipeline.
+    Returns the frequencies, the time of every frame in seconds and, with
+    trace_allocations=True, the peak of the memory allocated in every frame in bytes.
+    """
+    detector.reset()
+    if decimator is not None:
+        decimator.reset()
+
+    frequencies, durations, allocations = [], [], []
+    for start in range(0, len(samples) - CHUNK_SIZE + 1, CHUNK_SIZE):
+        chunk = samples[start:start + CHUNK_SIZE]
+
+        if trace_allocations:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+
+        begin = time.perf_counter()
+        if decimator is not None:
+            chunk = decimator.process(chunk)
+        frequency, _ = detector.process(chunk)
+        durations.append(time.perf_counter() - begin)
+
+        if trace_allocations:
+            allocations.append(tracemalloc.get_traced_memory()[1] - before)
+        frequencies.append(frequency)
+
+    return np.array(frequencies), np.array(durations), np.array(allocations)
+
+
+def benchmark_configuration(configuration, signals=SIGNALS, frequencies=FREQUENCIES, duration=DURATION):
+    """
+    Benchmarks one configuration, returns one result per signal kind.
+    Timing and allocation tracing are separate runs, tracemalloc slows everything down.
+    """
+    decimator, detector = build_pipeline(configuration)
+    # frames until the buffer holds only the signal
+    warmup = -(-detector.buffer_length // detector.chunk_size)
+
+    results = []
+    for kind in signals:
+        durations, allocations, errors = [], [], []
+        for seed, frequency in enumerate(frequencies):
+            samples = synthesize(kind, frequency, duration, seed=seed)
+
+            detected, frame_durations, _ = run_signal(decimator, detector, samples)
+            durations.append(frame_durations)
+            with np.errstate(divide="ignore"):
+                errors.append(np.abs(1200 * np.log2(detected[warmup:] / frequency)))
+
+            tracemalloc.start()
+            try:
+                allocations.append(run_signal(decimator, detector, samples, trace_allocations=True)[2])
+            finally:
+                tracemalloc.stop()
+
+        durations = np.concatenate(durations)
+        allocations = np.concatenate(allocations)
+        errors = np.nan_to_num(np.concatenate(errors), nan=np.inf, posinf=np.inf)
+
+        results.append({"configuration": dict(DEFAULT_CONFIGURATION, **configuration),
+                        "signal": kind,
+                        "frames": len(durations),
+                        "frames_per_second": round(len(durations) / np.sum(durations), 1),
+                        "latency_p50_ms": round(float(np.percentile(durations, 50)) * 1000, 4),
+                        "latency_p99_ms": round(float(np.percentile(durations, 99)) * 1000, 4),
+                        "allocated_bytes_per_frame": int(np.mean(allocations)),
+                        "cents_error_p50": round(float(np.median(errors)), 3),
+                        "cents_error_p95": round(float(np.percentile(errors, 95)), 3),
+                        "gross_error_rate": round(float(np.mean(errors > GROSS_ERROR_CENTS)), 3)})
+    return results
+
+
+def run_benchmark(configurations=CONFIGURATIONS, signals=SIGNALS, frequencies=FREQUENCIES, duration=DURATION,
+                  progress=None):
+    """
+    Benchmarks every configuration, returns a JSON-serializable report.
+    """
+    results = []
+    for index, configuration in enumerate(configurations):
+        if progress is not None:
+            progress.write(f"[{index + 1}/{len(configurations)}] {configuration}\n")
+        results.extend(benchmark_configuration(configuration, signals, frequencies, duration))
+
+    return {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "sample_rate": SAMPLE_RATE,
+            "chunk_size": CHUNK_SIZE,
+            "duration": duration,
+            "frequencies": list(frequencies),
+            "results": results}
+
+
+def result_key(result):
+    """
+    Identifies a result across reports.
+    """
+    return json.dumps(result["configuration"], sort_keys=True), result["signal"]
+
+
+def format_report(report, previous=None):
+    """
+    Formats a report as a table. With a previous report the change of the
+    frame rate and of the median error is shown as well.
+    """
+    previous_results = {}
+    if previous is not None:
+        previous_results = {result_key(result): result for result in previous["results"]}
+
+    lines = [f"{'configuration':52s} {'signal':11s} {'fps':>9s} {'p50 ms':>8s} {'p99 ms':>8s} "
+             f"{'bytes':>9s} {'c p50':>7s} {'c p95':>8s} {'gross':>6s}"]
+    for result in report["results"]:
+        changed = {key: value for key, value in result["configuration"].items()
+                   if DEFAULT_CONFIGURATION[key] != value or key == "method"}
+        description = " ".join(f"{key}={value}" for key, value in changed.items())
+        line = (f"{description:52s} {result['signal']:11s} {result['frames_per_second']:9.1f} "
+                f"{result['latency_p50_ms']:8.3f} {result['latency_p99_ms']:8.3f} "
+                f"{result['allocated_bytes_per_frame']:9d} {result['cents_error_p50']:7.2f} "
+                f"{result['cents_error_p95']:8.2f} {result['gross_error_rate']:6.2f}")
+
+        old = previous_results.get(result_key(result))
+        if old is not None:
+            line += (f"  fps x{result['frames_per_second'] / old['frames_per_second']:.2f}"
+                     f"  c p50 {result['cents_error_p50'] - old['cents_error_p50']:+.2f}")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(format_report(run_benchmark(progress=sys.stderr)))
@@ -0,0 +1,106 @@
+"""
+Anti-aliased sample rate reduction in front of the pitch detector.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+# decimation factors that are tried, largest first
+FACTORS = (6, 4, 3, 2)
+
+
+def lowpass_taps(num_taps, cutoff, attenuation=60):
+    """
+    Kaiser-windowed sinc low-pass filter, `cutoff` in cycles per sample (0 - 0.5).
+    The gain at DC is 1.
+    """
+    beta = 0.1102 * (attenuation - 8.7)
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(num_taps, beta)
+    return taps / np.sum(taps)
+
+
+def decimation_factor(sample_rate, max_frequency, chunk_size, harmonics=5, passband=0.8):
+    """
+    Returns the largest factor (from FACTORS, dividing chunk_size and sample_rate) that keeps
+    the first `harmonics` harmonics of max_frequency in the passband of the decimator, or 1.
+    """
+    for factor in FACTORS:
+        if chunk_size % factor or sample_rate % factor:
+            continue
+        if passband * sample_rate / (2 * factor) >= harmonics * max_frequency:
+            return factor
+    return 1
+
+
+class PolyphaseDecimator:
+    """
+    FIR low-pass filter + downsampling by an integer factor, chunk by chunk.
+
+    Only every `factor`-th output of the filter is computed (polyphase decomposition):
+    the input is viewed as rows of `factor` samples and multiplied with the taps split
+    into their `factor` phases, which gives the partial sums of every tap group for
+    every row in one matrix product. Each output is the sum of one diagonal of that
+    product. Everything happens in reusable buffers, a view of the rows needs no copy.
+    The last num_taps - 1 input samples and the phase are kept between chunks, so
+    consecutive chunks give the same output as one long signal.
+
+    The passband ends at `passband` times the new Nyquist frequency, the stopband
+    starts at the new Nyquist frequency.
+    """
+
+    def __init__(self, factor, taps_per_phase=36, passband=0.8, attenuation=60):
+        self.factor = factor
+        self.taps_per_phase = taps_per_phase
+        self.num_taps = factor * taps_per_phase
+
+        cutoff = (1 + passband) / 2 * 0.5 / factor
+        self.reversed_taps = lowpass_taps(self.num_taps, cutoff, attenuation)[::-1].copy()
+        # phase_taps[r, q] = reversed_taps[q * factor + r]
+        self.phase_taps = self.reversed_taps.reshape(taps_per_phase, factor).T.copy()
+
+        # input history followed by the current chunk, grown when a longer chunk arrives
+        self.extended = np.zeros(self.num_taps - 1)
+        self.products = np.zeros((0, taps_per_phase))
+        self.output = np.zeros(0)
+        self.offset = 0  # index in the next chunk of the first sample that ends an output window
+
+    def reset(self):
+        self.extended[:self.num_taps - 1] = 0
+        self.offset = 0
+
+    def process(self, chunk):
+        """
+        Returns the decimated chunk. The returned array is reused by the next call.
+        """
+        size = len(chunk)
+        history = self.num_taps - 1
+        if history + size > len(self.extended):
+            extended = np.zeros(history + size)
+            extended[:history] = self.extended[:history]
+            self.extended = extended
+
+        extended = self.extended[:history + size]
+        extended[history:] = chunk
+
+        # output m is the window extended[offset + m * factor:][:num_taps], which ends at chunk[offset + m * factor]
+        count = max(-(-(size - self.offset) // self.factor), 0)
+        rows = count + self.taps_per_phase - 1
+        if len(self.products) < rows:
+            self.products = np.zeros((rows, self.taps_per_phase))
+            self.output = np.zeros(count)
+        products = self.products[:rows]
+        output = self.output[:count]
+
+        # products[k, q] = sum of the taps of group q times the input row k
+        np.dot(extended[self.offset:self.offset + rows * self.factor].reshape(rows, self.factor),
+               self.phase_taps, out=products)
+
+        # output[m] = sum over q of products[m + q, q]
+        step = products.strides[0]
+        diagonals = as_strided(products, shape=(count, self.taps_per_phase),
+                               strides=(step, step + products.strides[1]), writeable=False)
+        np.sum(diagonals, axis=1, out=output)
+
+        self.offset = (self.offset - size) % self.factor
+        extended[:history] = extended[size:]
+        return output
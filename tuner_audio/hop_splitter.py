@@ -0,0 +1,48 @@
+"""
+Hop splitting: cuts reads of any length into hops of a fixed size.
+"""
+import numpy as np
+
+
+class HopSplitter:
+    """
+    Splits a stream of reads into hops of `size` samples, for the per-chunk detectors
+    (SignalGate, OnsetDetector) that see the reads of the source as they come. A read
+    of several hops (see PyAudioCallbackSource) gives every full hop in it, the samples
+    after the last full hop are kept in a preallocated buffer and completed by the
+    next read, so reads shorter than a hop are not lost.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.remainder = np.zeros(size)
+        self.filled = 0  # samples in the remainder
+
+    def reset(self):
+        """
+        Dropping the incomplete hop.
+        """
+        self.filled = 0
+
+    def hops(self, chunk):
+        """
+        Yields every hop completed by the chunk, the oldest first. A completed remainder
+        is yielded from the buffer, it is only valid until the next hop is requested.
+        """
+        size = self.size
+        start = 0
+        if self.filled:
+            start = min(size - self.filled, len(chunk))
+            self.remainder[self.filled:self.filled + start] = chunk[:start]
+            self.filled += start
+            if self.filled < size:
+                return
+            self.filled = 0
+            yield self.remainder
+
+        end = start + (len(chunk) - start) // size * size
+        for hop_start in range(start, end, size):
+            yield chunk[hop_start:hop_start + size]
+
+        self.filled = len(chunk) - end
+        self.remainder[:self.filled] = chunk[end:]
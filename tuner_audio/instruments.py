@@ -0,0 +1,179 @@
+"""
+Instruments and tunings of the tuner.
+"""
+import json
+import sys
+from bisect import bisect_right
+
+import numpy as np
+
+from tuner_audio.note_table import note_name_to_number
+
+
+class Tuning:
+    """
+    Named tuning: the notes of the strings, lowest string first (e.g. 'E2', 'A2', ...).
+    update() precomputes the target frequency of every string and the boundaries
+    between neighbouring strings (the geometric middle, i.e. half way in cents) from
+    a NoteTable, and only does that again when the A4 frequency of the table changed.
+    """
+
+    def __init__(self, name, strings):
+        self.name = name
+        self.strings = tuple(strings)
+        self.numbers = [note_name_to_number(string) for string in self.strings]
+
+        # strings sorted by pitch (re-entrant tunings are not sorted), for the search
+        self.order = sorted(range(len(self.numbers)), key=lambda index: self.numbers[index])
+        self.a4_frequency = None
+        self.frequencies = []
+        self.boundaries = []
+
+    def update(self, note_table):
+        """
+        Recomputing the target frequencies for the A4 frequency of `note_table` if it changed.
+        """
+        if note_table.a4_frequency == self.a4_frequency:
+            return
+        self.a4_frequency = note_table.a4_frequency
+        self.frequencies = [note_table.frequency(number) for number in self.numbers]
+
+        ordered = [self.frequencies[index] for index in self.order]
+        self.boundaries = [(low * high) ** 0.5 for low, high in zip(ordered, ordered[1:])]
+
+    def nearest_string(self, frequency):
+        """
+        Returns the index of the string with the target frequency nearest (in cents) to `frequency`.
+        """
+        return self.order[bisect_right(self.boundaries, frequency)]
+
+    def nearest_strings(self, frequencies):
+        """
+        Returns the indices of the nearest strings of an array of frequencies.
+        """
+        return np.asarray(self.order)[np.searchsorted(self.boundaries, frequencies, side="right")]
+
+    def __repr__(self):
+        return f"Tuning({self.name!r}, {self.strings})"
+
+
+class Instrument:
+    """
+    Definition of an instrument:
+    - tunings: Tunings, the first one is the standard tuning,
+    - pitch_range: plausible pitches (Hz) that the detector searches, by default
+      four semitones around the strings of all tunings,
+    - image: name of the picture in assets/images (without .png), instruments
+      without a picture are not shown by the instrument button of the GUI.
+    """
+
+    def __init__(self, name, tunings, pitch_range=None, image=None):
+        self.name = name
+        self.tunings = {tuning.name: tuning for tuning in tunings}
+        self.tuning = tunings[0]
+        self.image = image
+
+        if pitch_range is None:
+            numbers = [number for tuning in tunings for number in tuning.numbers]
+            pitch_range = (round(440 * 2 ** ((min(numbers) - 4 - 69) / 12)),
+                           round(440 * 2 ** ((max(numbers) + 4 - 69) / 12)))
+        self.pitch_range = tuple(pitch_range)
+
+    def add_tuning(self, tuning):
+        """
+        Adding (or replacing) a tuning.
+        """
+        self.tunings[tuning.name] = tuning
+        if self.tuning.name == tuning.name:
+            self.tuning = tuning
+
+    def set_tuning(self, name):
+        """
+        Selecting the tuning with the given name.
+        """
+        if name not in self.tunings:
+            raise ValueError(f"Unknown tuning '{name}' of {self.name}, expected one of {list(self.tunings)}")
+        self.tuning = self.tunings[name]
+
+    def __repr__(self):
+        return f"Instrument({self.name!r}, {list(self.tunings)})"
+
+
+INSTRUMENTS = [
+    Instrument("guitar", [Tuning("standard", ("E2", "A2", "D3", "G3", "B3", "E4")),
+                          Tuning("drop_d", ("D2", "A2", "D3", "G3", "B3", "E4")),
+                          Tuning("half_step_down", ("Eb2", "Ab2", "Db3", "Gb3", "Bb3", "Eb4")),
+                          Tuning("open_g", ("D2", "G2", "D3", "G3", "B3", "D4")),
+                          Tuning("open_d", ("D2", "A2", "D3", "F#3", "A3", "D4")),
+                          Tuning("dadgad", ("D2", "A2", "D3", "G3", "A3", "D4"))],
+               # E2 (82.4 Hz) - E4 (329.6 Hz), the range includes drop tunings
+               pitch_range=(65, 370), image="guitar"),
+    # re-entrant G4 C4 E4 A4, the range includes low G (G3, 196 Hz)
+    Instrument("ukulele", [Tuning("standard", ("G4", "C4", "E4", "A4")),
+                           Tuning("low_g", ("G3", "C4", "E4", "A4")),
+                           Tuning("d_tuning", ("A4", "D4", "F#4", "B4"))],
+               pitch_range=(180, 500), image="ukulele"),
+    Instrument("bass", [Tuning("standard", ("E1", "A1", "D2", "G2")),
+                        Tuning("drop_d", ("D1", "A1", "D2", "G2")),
+                        Tuning("five_string", ("B0", "E1", "A1", "D2", "G2"))]),
+    Instrument("violin", [Tuning("standard", ("G3", "D4", "A4", "E5"))]),
+    Instrument("viola", [Tuning("standard", ("C3", "G3", "D4", "A4"))]),
+    Instrument("cello", [Tuning("standard", ("C2", "G2", "D3", "A3"))]),
+    Instrument("mandolin", [Tuning("standard", ("G3", "D4", "A4", "E5"))]),
+    Instrument("banjo", [Tuning("open_g", ("G4", "D3", "G3", "B3", "D4")),
+                         Tuning("double_c", ("G4", "C3", "G3", "C4", "D4"))]),
+]
+
+
+def get_instrument(name):
+    """
+    Returns the instrument with the given name.
+    """
+    for instrument in INSTRUMENTS:
+        if instrument.name == name:
+            return instrument
+    raise ValueError(f"Unknown instrument '{name}', expected one of {[i.name for i in INSTRUMENTS]}")
+
+
+def next_instrument(instrument):
+    """
+    Returns the instrument after `instrument` that has a picture (the instrument button
+    of the GUI cycles through them).
+    """
+    shown = [item for item in INSTRUMENTS if item.image is not None]
+    if instrument not in shown:
+        return shown[0]
+    return shown[(shown.index(instrument) + 1) % len(shown)]
+
+
+def load_user_tunings(path):
+    """
+    Adding the tunings of a JSON file to the registry, unknown instruments are created.
+    The file holds a list of tunings:
+        [{"instrument": "guitar", "name": "open_c", "strings": ["C2", "G2", "C3", "G3", "C4", "E4"]},
+         {"instrument": "bouzouki", "name": "standard", "strings": ["G2", "D3", "A3", "D4"],
+          "pitch_range": [90, 330]}]
+    Invalid entries are reported and skipped. Returns the number of added tunings.
+    """
+    try:
+        with open(path) as file:
+            entries = json.load(file)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f'Error: Can not read tunings from {path}: {type(e).__name__} {e}\n')
+        return 0
+
+    added = 0
+    for entry in entries:
+        try:
+            tuning = Tuning(entry["name"], entry["strings"])
+            names = [instrument.name for instrument in INSTRUMENTS]
+            if entry["instrument"] in names:
+                INSTRUMENTS[names.index(entry["instrument"])].add_tuning(tuning)
+            else:
+                INSTRUMENTS.append(Instrument(entry["instrument"], [tuning], entry.get("pitch_range")))
+            added += 1
+        except (KeyError, TypeError, ValueError) as e:
+            sys.stderr.write(f'Error: Invalid tuning {entry} in {path}: {type(e).__name__} {e}\n')
+    return added
@@ -0,0 +1,169 @@
+"""
+Low-overhead metrics of the analyzer thread and the GUI loop.
+"""
+import json
+import os
+import sys
+from threading import Event, Thread
+from time import perf_counter
+
+import numpy as np
+
+
+class RollingHistogram:
+    """
+    The last `size` values in a preallocated ring. Recording is one store and
+    one increment, percentiles are only computed when a summary is requested.
+    Every histogram is written by a single thread, readers may see a value
+    that is being replaced, which is fine for monitoring.
+    """
+
+    def __init__(self, size=512):
+        self.values = np.zeros(size)
+        self.count = 0
+
+    def add(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+
+    def summary(self, scale=1000):
+        """
+        Returns count, mean, p50, p90, p99 and max of the rolling window,
+        multiplied by `scale` (seconds to milliseconds by default).
+        """
+        values = self.values[:min(self.count, len(self.values))] * scale
+        if not len(values):
+            return {"count": 0}
+
+        p50, p90, p99 = np.percentile(values, (50, 90, 99))
+        return {"count": self.count, "mean": round(float(np.mean(values)), 4), "p50": round(float(p50), 4),
+                "p90": round(float(p90), 4), "p99": round(float(p99), 4), "max": round(float(np.max(values)), 4)}
+
+
+class MetricsRegistry:
+    """
+    Named rolling histograms (durations in seconds), counters and gauges.
+    Gauges are functions that are only called for a snapshot, so counters that
+    an object keeps anyway (e.g. RingQueue.dropped) cost nothing on the hot path.
+    A disabled registry ignores all records.
+    """
+
+    def __init__(self, enabled=True, histogram_size=512):
+        self.enabled = enabled
+        self.histogram_size = histogram_size
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram(self.histogram_size)
+        histogram.add(seconds)
+
+    def increment(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, function):
+        """
+        Registering a function that returns the current value of `name`.
+        """
+        self.gauges[name] = function
+
+    def snapshot(self):
+        """
+        Returns all metrics as a JSON-serializable dict, durations in milliseconds.
+        """
+        gauges = {}
+        for name, function in list(self.gauges.items()):
+            try:
+                gauges[name] = function()
+            except Exception as e:
+                gauges[name] = f"{type(e).__name__} {e}"
+
+        # list() copies the dicts at once, other threads may add entries meanwhile
+        return {"histograms_ms": {name: histogram.summary() for name, histogram in sorted(list(self.histograms.items()))},
+                "counters": dict(sorted(list(self.counters.items()))),
+                "gauges": dict(sorted(gauges.items()))}
+
+    def format_summary(self, separator="\n"):
+        """
+        Short text of all metrics for the debug overlay: p50/p99 of every histogram
+        in milliseconds, then the counters and gauges.
+        """
+        snapshot = self.snapshot()
+        items = []
+        for name, summary in snapshot["histograms_ms"].items():
+            if summary["count"]:
+                items.append(f"{name} {summary['p50']:.2f}/{summary['p99']:.2f}ms")
+        for name, value in list(snapshot["counters"].items()) + list(snapshot["gauges"].items()):
+            items.append(f"{name}={value}")
+        return separator.join(items)
+
+    def dump(self, path):
+        """
+        Writing a snapshot as JSON. The file is replaced at once, so readers never see a partial dump.
+        """
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2)
+        os.replace(temporary_path, path)
+
+
+class StageTimer:
+    """
+    Times consecutive stages of a frame: start() marks the beginning, every
+    lap(name) records the time since the previous mark as `prefix + name`.
+    """
+
+    def __init__(self, registry, prefix=""):
+        self.registry = registry
+        self.prefix = prefix
+        self.last = 0.0
+
+    def start(self):
+        self.last = perf_counter()
+
+    def lap(self, name):
+        if not self.registry.enabled:
+            return
+        now = perf_counter()
+        self.registry.record(self.prefix + name, now - self.last)
+        self.last = now
+
+
+class MetricsDumper(Thread):
+    """
+    Daemon thread that dumps a registry to a JSON file every `interval` seconds.
+    """
+
+    def __init__(self, registry, path, interval=10):
+        Thread.__init__(self, daemon=True)
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.stopped = Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.registry.dump(self.path)
+            except OSError as e:
+                sys.stderr.write(f'Error: Can not write metrics to {self.path}: {type(e).__name__} {e}\n')
+
+    def stop(self):
+        """
+        Stopping the thread after a last dump.
+        """
+        self.stopped.set()
+        try:
+            self.registry.dump(self.path)
+        except OSError as e:
+            sys.stderr.write(f'Error: Can not write metrics to {self.path}: {type(e).__name__} {e}\n')
+
+
+# registry shared by the analyzer thread and the GUI
+registry = MetricsRegistry()
@@ -0,0 +1,104 @@
+"""
+Precomputed note tables: note lookups without logarithms or powers per sample.
+"""
+import re
+from bisect import bisect_right
+
+import numpy as np
+
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+NOTE_PATTERN = re.compile(r"([A-Ga-g])([#b]?)(-?[0-9]+)$")
+
+
+def note_name_to_number(name):
+    """
+    Converting a note name with octave to a note number. For example: 'A4' is 69, 'C#3' is 49.
+    Flats ('Bb2') are accepted too.
+    """
+    match = NOTE_PATTERN.match(name.strip())
+    if match is None:
+        raise ValueError(f"Invalid note name '{name}', expected e.g. 'E2', 'F#3' or 'Bb1'")
+
+    letter, accidental, octave = match.groups()
+    number = NOTE_NAMES.index(letter.upper()) + {"": 0, "#": 1, "b": -1}[accidental]
+    return number + (int(octave) + 1) * 12
+
+
+def note_number_to_name(number):
+    """
+    Converting a note number to a note name with octave. For example: 69 is 'A4'.
+    """
+    return NOTE_NAMES[number % 12] + str(number // 12 - 1)
+
+
+class NoteTable:
+    """
+    Frequencies of the note numbers 0 - 127 (C-1 - G9) for one A4 frequency, and the
+    frequency of every cent between them. A frequency is converted to a (fractional)
+    note number with a binary search in the cent table and a linear interpolation
+    inside the found cent (the error is below 0.001 cents).
+    The tables are only recomputed when A4 changes (set_a4_frequency).
+    """
+
+    LOWEST_NUMBER = 0
+    HIGHEST_NUMBER = 127
+
+    def __init__(self, a4_frequency=440):
+        self.a4_frequency = None
+        self.set_a4_frequency(a4_frequency)
+
+    def set_a4_frequency(self, a4_frequency):
+        """
+        Recomputing the tables for a new A4 frequency. Returns True if it changed.
+        """
+        if a4_frequency == self.a4_frequency:
+            return False
+        self.a4_frequency = a4_frequency
+
+        numbers = np.arange(self.LOWEST_NUMBER, self.HIGHEST_NUMBER + 1)
+        self.frequencies = a4_frequency * 2.0 ** ((numbers - 69) / 12)
+
+        # cent_frequencies[i] is the frequency of note number first_cent + i / 100
+        self.first_cent = self.LOWEST_NUMBER - 0.5
+        cents = np.arange(int((self.HIGHEST_NUMBER - self.LOWEST_NUMBER + 1) * 100) + 1)
+        self.cent_frequencies = a4_frequency * 2.0 ** ((self.first_cent + cents / 100 - 69) / 12)
+
+        # lists for the scalar lookups, bisect on a list is faster than numpy for one value
+        self.frequency_list = self.frequencies.tolist()
+        self.cent_list = self.cent_frequencies.tolist()
+        return True
+
+    def frequency(self, number):
+        """
+        Returns the frequency of an integer note number (computed for numbers outside the table).
+        """
+        index = number - self.LOWEST_NUMBER
+        if 0 <= index < len(self.frequency_list):
+            return self.frequency_list[index]
+        return self.a4_frequency * 2.0 ** ((number - 69) / 12)
+
+    def number(self, frequency):
+        """
+        Returns the fractional note number of a frequency, like 12 * log2(f / a4) + 69.
+        Frequencies outside the table are clipped to its ends.
+        """
+        cent_list = self.cent_list
+        index = bisect_right(cent_list, frequency) - 1
+        if index < 0:
+            return self.first_cent
+        if index >= len(cent_list) - 1:
+            return self.first_cent + (len(cent_list) - 1) / 100
+
+        low, high = cent_list[index], cent_list[index + 1]
+        return self.first_cent + (index + (frequency - low) / (high - low)) / 100
+
+    def fractional_frequency(self, number):
+        """
+        Returns the frequency of a fractional note number, like a4 * 2 ** ((number - 69) / 12).
+        Numbers outside the table are clipped to its ends.
+        """
+        position = (number - self.first_cent) * 100
+        index = min(max(int(position), 0), len(self.cent_list) - 2)
+        fraction = min(max(position - index, 0.0), 1.0)
+        low, high = self.cent_list[index], self.cent_list[index + 1]
+        return low + fraction * (high - low)
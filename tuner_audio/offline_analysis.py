@@ -0,0 +1,127 @@
+"""
+Offline (headless) pitch analysis of WAV files.
+"""
+import csv
+import json
+
+import numpy as np
+
+from tuner_audio.audio_analyzer import MIN_CONFIDENCE, NO_SIGNAL, AudioAnalyzer
+from tuner_audio.audio_source import WavFileSource
+from tuner_audio.note_table import NoteTable
+from tuner_audio.pitch_detector import PitchDetector
+
+FIELDS = ["time", "frequency", "note", "cents", "confidence"]
+TUNING_FIELDS = ["string", "string_cents"]
+
+BLOCK_FRAMES = 256  # frames converted to notes at once
+
+
+def frame_rows(times, frequencies, confidences, a4_frequency, tuning=None):
+    """
+    Builds the rows of the result table for arrays of frames, the notes are converted
+    in one vectorized call. With a tuning the rows also hold the nearest string and
+    the cents from its target. Frames without a frequency get empty note fields.
+    """
+    frequencies = np.asarray(frequencies, dtype=float)
+    notes = AudioAnalyzer.analyze_frequencies(frequencies, a4_frequency)
+    valid = notes["valid"]
+
+    columns = {"time": np.round(times, 4).tolist(),
+               "frequency": np.round(np.where(valid, frequencies, 0.0), 2).tolist(),
+               "note": AudioAnalyzer.note_names(notes),
+               "cents": np.round(notes["cents"], 1).tolist(),
+               "confidence": np.round(confidences, 3).tolist()}
+    if tuning is not None:
+        strings = tuning.nearest_strings(frequencies)
+        columns["string"] = [tuning.strings[string] if ok else "" for ok, string in zip(valid.tolist(), strings.tolist())]
+        columns["string_cents"] = np.round((notes["number"] - np.asarray(tuning.numbers)[strings]) * 100, 1).tolist()
+
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    for row, ok in zip(rows, valid.tolist()):
+        if not ok:
+            row["cents"] = None
+            if tuning is not None:
+                row["string_cents"] = None
+    return rows
+
+
+def analyze_source(source, detector, a4_frequency=440, tuning=None, tracker=None):
+    """
+    Generator streaming an AudioSource through a PitchDetector.
+    Yields one row (time, frequency, note, cents, confidence) per chunk, the time
+    is the end of the chunk in seconds. With a Tuning the nearest string is added,
+    with a PitchTracker the frequencies are smoothed over time.
+    The notes are converted in blocks of BLOCK_FRAMES frames.
+    """
+    if tuning is not None:
+        tuning.update(NoteTable(a4_frequency))
+
+    frequencies = np.zeros(BLOCK_FRAMES)
+    confidences = np.zeros(BLOCK_FRAMES)
+    first_frame = count = 0
+    for index, chunk in enumerate(source):
+        frequencies[count], confidences[count] = detector.process(chunk)
+        if tracker is not None:
+            # unreliable frames (e.g. while the buffer fills) are not tracked
+            frequency = frequencies[count] if confidences[count] >= MIN_CONFIDENCE else NO_SIGNAL
+            frequencies[count] = tracker.update(frequency)
+        count += 1
+        if count == BLOCK_FRAMES:
+            yield from frame_rows(frame_times(first_frame, count, source), frequencies[:count],
+                                  confidences[:count], a4_frequency, tuning)
+            first_frame, count = index + 1, 0
+
+    if count:
+        yield from frame_rows(frame_times(first_frame, count, source), frequencies[:count],
+                              confidences[:count], a4_frequency, tuning)
+
+
+def frame_times(first_frame, count, source):
+    """
+    Returns the end times (seconds) of `count` chunks, starting with chunk `first_frame`.
+    """
+    return (np.arange(first_frame, first_frame + count) + 1) * source.chunk_size / source.sample_rate
+
+
+def analyze_wav(path, method="autocorr", a4_frequency=440, detector=None, tuning=None, tracker=None):
+    """
+    Generator streaming a WAV file through the pitch detection pipeline.
+    The file is read chunk by chunk, so long recordings are never loaded at once.
+    """
+    with WavFileSource(path, PitchDetector.CHUNK_SIZE) as source:
+        if detector is None:
+            detector = PitchDetector(method, sample_rate=source.sample_rate)
+        source.chunk_size = detector.chunk_size
+
+        yield from analyze_source(source, detector, a4_frequency, tuning, tracker)
+
+
+def write_csv(rows, file):
+    """
+    Writes result rows as CSV.
+    """
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(file, fieldnames=FIELDS + (TUNING_FIELDS if "string" in row else []))
+            writer.writeheader()
+        writer.writerow(row)
+    if writer is None:
+        csv.DictWriter(file, fieldnames=FIELDS).writeheader()
+
+
+def write_json(rows, file):
+    """
+    Writes result rows as a JSON array, one row per line, without collecting them first.
+    Nothing is written before the first row, so a source that can not be opened (see
+    analyze_wav) leaves no partial array behind.
+    """
+    separator = "["
+    for row in rows:
+        file.write(separator + "\n  " + json.dumps(row))
+        separator = ","
+    file.write(("[" if separator == "[" else "") + "\n]\n")
+
+
+WRITERS = {"csv": write_csv, "json": write_json}
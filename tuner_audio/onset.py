@@ -0,0 +1,79 @@
+"""
+Onset detection: finds the start of a new pluck in the stream of chunks.
+"""
+from collections import deque
+
+import numpy as np
+
+from tuner_audio.hop_splitter import HopSplitter
+
+
+class OnsetDetector:
+    """
+    Spectral flux onset detector.
+
+    The flux of a chunk is the summed rise of its magnitude spectrum against the previous
+    chunk, relative to the magnitude of the previous chunk (falling bins are ignored, so
+    a decaying note gives no flux, and the loudness of the input does not matter).
+    A chunk is an onset if its flux is above `threshold` times the median flux of the
+    last `history` chunks plus min_flux, and no onset was found in the last
+    min_interval chunks. A pluck raises the flux of one or two chunks by an order of
+    magnitude, the sustain of a note stays close to the median.
+    """
+
+    def __init__(self, chunk_size, threshold=3.0, min_flux=0.5, history=16, min_interval=3):
+        self.threshold = threshold
+        self.min_flux = min_flux
+        self.min_interval = min_interval
+        self.history = deque(maxlen=history)
+
+        self.splitter = HopSplitter(chunk_size)
+        self.window = np.hanning(chunk_size)
+        self.windowed = np.zeros(chunk_size)
+        self.spectrum = np.zeros(chunk_size // 2 + 1)
+        self.previous = np.zeros(chunk_size // 2 + 1)
+
+        self.chunks_since_onset = min_interval
+        self.onsets = 0  # number of found onsets, for the metrics
+        self.flux = 0.0
+
+    def reset(self):
+        """
+        Forgetting the previous spectrum, the next loud chunk is an onset.
+        """
+        self.splitter.reset()
+        self.history.clear()
+        self.previous[:] = 0
+        self.chunks_since_onset = self.min_interval
+
+    def process(self, chunk):
+        """
+        Returns True if a new note starts in the chunk. Reads are tested hop by hop (see
+        HopSplitter), an onset in any hop the read completes counts.
+        """
+        onset = False
+        for hop in self.splitter.hops(chunk):
+            onset |= self.process_hop(hop)
+        return onset
+
+    def process_hop(self, chunk):
+        """
+        Testing one hop of chunk_size samples.
+        """
+        np.multiply(chunk, self.window, out=self.windowed)
+        spectrum = self.spectrum
+        np.abs(np.fft.rfft(self.windowed), out=spectrum)
+
+        rise = np.maximum(spectrum - self.previous, 0)
+        self.flux = flux = float(np.sum(rise)) / max(float(np.sum(self.previous)), 1.0)
+        self.spectrum, self.previous = self.previous, spectrum
+
+        limit = self.threshold * (float(np.median(self.history)) if self.history else 0.0) + self.min_flux
+        self.history.append(flux)
+        self.chunks_since_onset += 1
+
+        if flux > limit and self.chunks_since_onset > self.min_interval:
+            self.chunks_since_onset = 0
+            self.onsets += 1
+            return True
+        return False
@@ -0,0 +1,93 @@
+"""
+Sub-bin refinement of spectral peaks.
+"""
+import numpy as np
+
+
+def parabolic_vertex(values, index):
+    """
+    Refines the position of an extremum with a parabola through its neighbours.
+    Returns a fractional index.
+    """
+    if index <= 0 or index >= len(values) - 1:
+        return float(index)
+
+    left, center, right = values[index - 1], values[index], values[index + 1]
+    denominator = left - 2 * center + right
+    if denominator == 0:
+        return float(index)
+    return index + 0.5 * (left - right) / denominator
+
+
+def parabolic_peak(values, index):
+    """
+    Fractional index and height of a maximum, from a parabola through its neighbours.
+    """
+    if index <= 0 or index >= len(values) - 1:
+        return float(index), float(values[index])
+
+    left, center, right = values[index - 1], values[index], values[index + 1]
+    denominator = left - 2 * center + right
+    if denominator >= 0:
+        return float(index), float(center)
+    offset = 0.5 * (left - right) / denominator
+    return index + offset, float(center - 0.25 * (left - right) * offset)
+
+
+def quadratic_peak(magnitude, index):
+    """
+    Fractional bin of the spectral peak next to `index`.
+    The parabola is fitted to the log magnitude (Gaussian interpolation), which is
+    much less biased than a fit to the linear magnitude for Hann-windowed tones.
+    """
+    # the HPS peak may be one bin off the peak of the fundamental itself
+    if 0 < index < len(magnitude) - 1:
+        index += int(np.argmax(magnitude[index - 1:index + 2])) - 1
+    if index <= 0 or index >= len(magnitude) - 1:
+        return float(index)
+
+    left, center, right = np.log(np.maximum(magnitude[index - 1:index + 2], np.finfo(float).tiny))
+    denominator = left - 2 * center + right
+    if denominator >= 0:
+        return float(index)
+    return index + 0.5 * (left - right) / denominator
+
+
+class PhaseVocoder:
+    """
+    Frequency estimation from the phase advance of a bin between two consecutive frames.
+
+    A stationary tone of frequency f advances its phase by 2 pi f advance / sample_rate
+    between two frames `advance` samples apart. The measured advance is only known
+    modulo 2 pi, so it is unwrapped around a coarse estimate (e.g. quadratic_peak()),
+    which must be within sample_rate / (2 advance) Hz of the true frequency.
+    """
+
+    def __init__(self, fft_size, sample_rate):
+        self.fft_size = fft_size
+        self.sample_rate = sample_rate
+        self.max_advance = fft_size // 2  # keeps the unwrapping range at +-1 bin or more
+
+        self.previous_spectrum = np.zeros(fft_size // 2 + 1, dtype=complex)
+        self.has_previous = False
+
+    def reset(self):
+        self.has_previous = False
+
+    def estimate(self, spectrum, bin_estimate, advance):
+        """
+        Returns the refined frequency of the peak at the fractional bin `bin_estimate`,
+        or None if there is no usable previous frame. The spectrum is remembered
+        for the next call.
+        """
+        frequency = None
+        index = int(round(bin_estimate))
+        if self.has_previous and 0 < advance <= self.max_advance and 0 < index < len(spectrum):
+            measured = np.angle(spectrum[index]) - np.angle(self.previous_spectrum[index])
+            expected = 2 * np.pi * bin_estimate * advance / self.fft_size
+            deviation = (measured - expected + np.pi) % (2 * np.pi) - np.pi
+            frequency = (expected + deviation) * self.sample_rate / (2 * np.pi * advance)
+
+        np.copyto(self.previous_spectrum, spectrum[:len(self.previous_spectrum)])
+        self.has_previous = True
+        return frequency
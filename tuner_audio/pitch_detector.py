@@ -0,0 +1,392 @@
+"""
+Pitch detection on a stream of audio chunks, independent of the audio capture.
+"""
+import numpy as np
+
+from tuner_audio.autocorrelation import AutocorrelationEngine
+from tuner_audio.fft_backends import FFT_BACKENDS, get_fft_backend
+from tuner_audio.metrics import MetricsRegistry, StageTimer
+from tuner_audio.peak_interpolation import PhaseVocoder, parabolic_peak, quadratic_peak
+from tuner_audio.pitch_search import PitchSearch
+from tuner_audio.spectral import HarmonicProductSpectrum
+from tuner_audio.ring_buffer import RingBuffer
+from tuner_audio.yin import YinDetector
+
+DEBUGGING_EN = False
+
+
+class PitchDetector:
+    """
+    PitchDetector keeps the audio window and all DSP state (windows, FFT plans,
+    buffers) and finds the frequency of the loudest tone every time a chunk is
+    processed. It does not read any device and does not start any thread.
+
+    Methods:
+    - "autocorr": autocorrelation of the first half of the window,
+    - "fft": Harmonic Product Spectrum of the zero-padded, Hanning-windowed buffer.
+      The HPS peak is refined below one bin (see peak_refinement), so unless the
+      refinement is off the default buffer is 4x shorter,
+    - "yin": YIN with parabolic interpolation. It is accurate to a fraction of a cent
+      on a much shorter window, so its default buffer is 4x shorter.
+
+    set_pitch_range() restricts the lag (or bin) search to the plausible pitches of an
+    instrument. With tracking enabled the search is narrowed further around a locked
+    note (see PitchSearch).
+
+    onset() marks the start of a new note (see OnsetDetector): the audio before it is
+    left out, the analysed window restarts with the newest ONSET_WINDOWS[0] chunks and
+    grows through ONSET_WINDOWS back to the whole buffer while the note sustains.
+    """
+
+    SAMPLING_RATE = 48000              # sample frequency in Hz
+    CHUNK_SIZE = 3000                  # number of samples
+    BUFFER_CHUNKS = 16                 # window size in chunks
+    YIN_BUFFER_CHUNKS = 4              # window size of the "yin" method in chunks
+    FFT_BUFFER_CHUNKS = 4              # window size of the "fft" method with peak refinement in chunks
+    BUFFER_LENGTH = CHUNK_SIZE * BUFFER_CHUNKS    # window size in samples
+    NUM_HPS = 5                        # HPS (Harmonic Product Spectrum)
+    ACF_MIN_FREQUENCY = 32             # default range of the "autocorr" method in Hz
+    ACF_MAX_FREQUENCY = 440
+    ACF_CANDIDATE_RATIO = 0.8          # sampled autocorrelation peaks above this share of the highest are refined
+    ACF_PEAK_RATIO = 0.95              # a shorter lag wins with this share of the height of the highest peak
+    ONSET_WINDOWS = (2, 4, 8)          # analysed window in chunks after an onset, then the whole buffer
+
+    MIN_FREQUENCY = 60                 # lowest frequency of the "yin" method in Hz
+    MAX_FREQUENCY = 1500               # highest frequency of the "yin" method in Hz
+    YIN_THRESHOLD = 0.1                # absolute threshold of the "yin" method
+
+    METHODS = ("autocorr", "fft", "yin")
+    PEAK_REFINEMENTS = ("none", "quadratic", "phase")
+
+    def __init__(self, method="autocorr", sample_rate=SAMPLING_RATE, chunk_size=CHUNK_SIZE,
+                 buffer_length=None, num_hps=NUM_HPS, acf_mode="fft", fft_backend="numpy",
+                 peak_refinement="phase", tracking=True, metrics=None):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown pitch detection method '{method}', expected one of {self.METHODS}")
+        if peak_refinement not in self.PEAK_REFINEMENTS:
+            raise ValueError(f"Unknown peak refinement '{peak_refinement}', expected one of {self.PEAK_REFINEMENTS}")
+
+        self.method = method
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        if buffer_length is None:
+            if method == "yin":
+                buffer_length = chunk_size * self.YIN_BUFFER_CHUNKS
+            elif method == "fft" and peak_refinement != "none":
+                buffer_length = chunk_size * self.FFT_BUFFER_CHUNKS
+            else:
+                buffer_length = chunk_size * self.BUFFER_CHUNKS
+        self.buffer_length = buffer_length
+
+        # "direct", "fft" or "incremental", can be switched at runtime with set_acf_mode()
+        self.autocorrelation = AutocorrelationEngine(acf_mode, hop=self.chunk_size)
+        self.acf_window = self.buffer_length // 2
+        self.acf_bounds = self.default_acf_bounds()
+
+        # "numpy", "scipy", "radix2" or an FFTBackend instance
+        self.fft_backend = get_fft_backend(fft_backend)
+        self.ring_buffer = RingBuffer(self.buffer_length)
+        self.hanning_window = np.hanning(self.buffer_length)
+
+        # Zero-padding to the nearest power of 2.
+        # It allows one to use a longer FFT, which will produce a longer
+        # FFT result vector. A longer FFT result has more frequency bins that are
+        # more closely spaced in frequency.
+        self.fft_size = int(2 ** np.ceil(np.log2(self.buffer_length)))
+        self.windowed_data = np.zeros(self.fft_size)  # the tail stays zero (padding)
+        self.spectrum = np.zeros(self.fft_size // 2 + 1, dtype=complex)
+        self.magnitude_data = np.zeros(self.fft_size // 2 + 1)
+        self.hps = HarmonicProductSpectrum(self.fft_size, self.sample_rate, num_hps)
+
+        # "none" - bin frequency, "quadratic" - Gaussian interpolation of the peak,
+        # "phase" - phase vocoder over consecutive frames (quadratic for the first one)
+        self.peak_refinement = peak_refinement
+        self.phase_vocoder = PhaseVocoder(self.fft_size, self.sample_rate)
+        self.advance = 0  # samples between the current and the previous frame
+
+        # window schedule after an onset: analysed lengths (samples) shorter than the buffer
+        self.onset_lengths = [chunk_size * chunks for chunks in self.ONSET_WINDOWS
+                              if chunk_size * chunks < self.buffer_length]
+        self.samples_since_onset = None  # None - the whole buffer is analysed
+        self.analysis_length = self.buffer_length
+        self.hanning_windows = {self.buffer_length: self.hanning_window}
+
+        # YIN detectors by analysed length, built on first use
+        self.yin_detectors = {}
+        self.yin = None
+        if self.method == "yin":
+            self.yin = self.get_yin(self.buffer_length)
+
+        # full search range, restricted to an instrument with set_pitch_range()
+        self.search = PitchSearch(*self.default_pitch_range(), tracking=tracking)
+        self.hps_bounds = None
+        self.yin_bounds = None
+
+        # stage timings (buffer_shift, window, transform, peak_pick), off without a registry
+        self.stages = StageTimer(metrics if metrics is not None else MetricsRegistry(enabled=False), "detector.")
+
+        self.percent_corr = []
+
+    def default_pitch_range(self):
+        """
+        Returns the range (min, max) in Hz that the method searches without an instrument range.
+        """
+        if self.method == "fft":
+            return self.hps.frequencies[self.hps.low_cut_bin + 1], self.sample_rate / 2
+        if self.method == "yin":
+            return self.MIN_FREQUENCY, self.MAX_FREQUENCY
+        return self.sample_rate / self.acf_bounds[1], self.sample_rate / self.acf_bounds[0]
+
+    def default_acf_bounds(self):
+        """
+        Returns the default lag bounds, the lags of ACF_MAX_FREQUENCY - ACF_MIN_FREQUENCY
+        at the sample rate of the detector.
+        """
+        min_lag, max_lag = self.lag_bounds(self.ACF_MIN_FREQUENCY, self.ACF_MAX_FREQUENCY)
+        return [min_lag, min(max_lag, self.buffer_length - self.acf_window - 1)]
+
+    def set_pitch_range(self, min_frequency=None, max_frequency=None):
+        """
+        Restricting the search to the pitches between min_frequency and max_frequency (Hz).
+        Without arguments the default range of the method is searched again.
+        """
+        if min_frequency is None or max_frequency is None:
+            self.acf_bounds = self.default_acf_bounds()
+            self.hps_bounds = None
+            self.yin_bounds = None
+            self.search.set_range(*self.default_pitch_range())
+        else:
+            # the lag must leave room for the autocorrelation window in the buffer
+            min_lag, max_lag = self.lag_bounds(min_frequency, max_frequency)
+            self.acf_bounds = [min_lag, min(max_lag, self.buffer_length - self.acf_window - 1)]
+            self.hps_bounds = self.hps.bin_bounds(min_frequency, max_frequency)
+            self.yin_bounds = (min_lag, max_lag)
+            self.search.set_range(min_frequency, max_frequency)
+
+        # the plans and the sliding state of the old bounds are kept, but get stale
+        self.autocorrelation.reset()
+
+    def lag_bounds(self, min_frequency, max_frequency):
+        """
+        Returns the lags (first, last + 1) that cover a frequency range.
+        """
+        return (max(int(np.floor(self.sample_rate / max_frequency)), 1),
+                int(np.ceil(self.sample_rate / min_frequency)) + 1)
+
+    @staticmethod
+    def narrow_bounds(bounds, full_bounds):
+        """
+        Clips bounds (first, last + 1) to the full bounds, keeping at least one element.
+        """
+        start = min(max(bounds[0], full_bounds[0]), full_bounds[1] - 1)
+        return start, max(min(bounds[1], full_bounds[1]), start + 1)
+
+    def set_acf_mode(self, mode):
+        """
+        Switching the autocorrelation mode ("direct", "fft" or "incremental") at runtime.
+        """
+        self.autocorrelation.set_mode(mode)
+
+    def reset(self):
+        """
+        Clearing the audio buffer, so the detector can be reused for another signal.
+        Windows and FFT plans are kept.
+        """
+        self.ring_buffer.clear()
+        self.autocorrelation.reset()
+        self.phase_vocoder.reset()
+        self.search.reset()
+        self.samples_since_onset = None
+        self.analysis_length = self.buffer_length
+
+    def onset(self):
+        """
+        A new note starts with the next chunk: the analysis restarts with a short window.
+        """
+        if not self.onset_lengths:
+            return
+        self.samples_since_onset = 0
+        self.search.reset()
+
+    def update_analysis_length(self, size):
+        """
+        Growing the analysed window by a chunk of `size` samples after an onset.
+        The incremental state and the phases of the previous window are dropped
+        when the length changes.
+        """
+        if self.samples_since_onset is None:
+            return
+
+        self.samples_since_onset += size
+        length = self.buffer_length
+        if self.samples_since_onset < self.buffer_length:
+            length = self.onset_lengths[0]
+            for onset_length in self.onset_lengths:
+                if onset_length <= self.samples_since_onset:
+                    length = onset_length
+        else:
+            self.samples_since_onset = None
+
+        if length != self.analysis_length:
+            self.analysis_length = length
+            self.autocorrelation.reset()
+            self.phase_vocoder.reset()
+
+    def analysed_samples(self):
+        """
+        Returns the analysed part of the buffer (the newest analysis_length samples).
+        """
+        if self.analysis_length == self.buffer_length:
+            return self.ring_buffer.view()
+        return self.ring_buffer.latest(self.analysis_length)
+
+    def get_yin(self, length):
+        """
+        Returns the YIN detector of an analysed length.
+        """
+        if length not in self.yin_detectors:
+            yin_window = length - int(np.ceil(self.sample_rate / self.MIN_FREQUENCY)) - 1
+            self.yin_detectors[length] = YinDetector(self.sample_rate, yin_window, self.MIN_FREQUENCY,
+                                                     self.MAX_FREQUENCY, self.YIN_THRESHOLD)
+        return self.yin_detectors[length]
+
+    def process(self, data):
+        """
+        Appends a chunk of samples to the audio buffer and detects the pitch of the buffer.
+        Returns the frequency of the loudest tone and a confidence between 0 and 1.
+        """
+        self.stages.start()
+
+        # append data to audio buffer
+        self.ring_buffer.write(data)
+        self.advance = len(data)
+        self.update_analysis_length(len(data))
+        self.stages.lap("buffer_shift")
+
+        # the incremental autocorrelation assumes that the window moved by exactly one hop
+        if len(data) != self.chunk_size:
+            self.autocorrelation.reset()
+
+        if self.method == "fft":
+            frequency, confidence = self.detect_fft(data)
+        elif self.method == "yin":
+            frequency, confidence = self.detect_yin()
+        else:
+            frequency, confidence = self.detect_autocorr()
+
+        self.search.update(frequency, confidence)
+        self.stages.lap("peak_pick")
+        return frequency, confidence
+
+    def detect_fft(self, data):
+        """
+        FFT + HPS pitch detection on the current buffer.
+        """
+        # apply the FFT on the whole buffer (with zero-padding + hanning window)
+        # - Hanning window helps to control leakage, thereby increasing the dynamic
+        #   range of the analysis.
+        length = self.analysis_length
+        if length == self.buffer_length:
+            windowed_data = self.ring_buffer.apply_window(self.hanning_window, self.windowed_data)
+        else:
+            # a shorter window after an onset, the rest of the FFT input is zero-padding
+            if length not in self.hanning_windows:
+                self.hanning_windows[length] = np.hanning(length)
+            windowed_data = self.windowed_data
+            np.multiply(self.analysed_samples(), self.hanning_windows[length], out=windowed_data[:length])
+            windowed_data[length:self.buffer_length] = 0
+        self.stages.lap("window")
+        self.fft_backend.rfft(windowed_data, out=self.spectrum)
+        magnitude_data = np.abs(self.spectrum, out=self.magnitude_data)
+        self.stages.lap("transform")
+
+        # ----- Debugging part -----
+        if DEBUGGING_EN:
+            print(f"Raw data:  {data[:6]}")
+            for name in FFT_BACKENDS:
+                other = abs(get_fft_backend(name).rfft(windowed_data))
+                print(f"{name:9s}  {other[:6]}")
+
+                if name == "numpy":
+                    true_values = np.sum(np.isclose(magnitude_data, other))
+                    percents = round(true_values / len(magnitude_data) * 100, 2)
+                    self.percent_corr.append(percents)
+            print(f"FFT ({self.fft_backend.name}) calculated for  {len(self.percent_corr)}  \
+    samples: {round(np.mean(self.percent_corr), 2)}% of values are close to numpy (atol 1e-8).")
+
+        # HPS (Harmonic Product Spectrum) on the first half of the FFT output data,
+        # frequencies below 60Hz are masked
+        min_frequency, max_frequency = self.search.next_range()
+        bounds = self.hps_bounds
+        if not self.search.full_scan:
+            bounds = self.narrow_bounds(self.hps.bin_bounds(min_frequency, max_frequency),
+                                        bounds or (0, self.hps.num_bins))
+        frequency, peak = self.hps.detect_pitch(magnitude_data, bounds)
+        confidence = self.hps.confidence(magnitude_data, peak)
+        if self.peak_refinement == "none":
+            return frequency, confidence
+
+        bin_estimate = quadratic_peak(magnitude_data, peak)
+        frequency = bin_estimate * self.sample_rate / self.fft_size
+        if self.peak_refinement == "phase":
+            refined = self.phase_vocoder.estimate(self.spectrum, bin_estimate, self.advance)
+            if refined is not None:
+                frequency = refined
+        return frequency, confidence
+
+    def detect_autocorr(self):
+        """
+        Autocorrelation pitch detection on the first half of the current buffer.
+        """
+        buffer = self.analysed_samples()
+        window = self.acf_window
+        acf_bounds = self.acf_bounds
+        if len(buffer) < self.buffer_length:
+            # a shorter window after an onset, the lags must still fit into it
+            window = len(buffer) // 2
+            acf_bounds = [acf_bounds[0], min(acf_bounds[1], len(buffer) - window - 1)]
+
+        min_frequency, max_frequency = self.search.next_range()
+        bounds = acf_bounds
+        if not self.search.full_scan:
+            bounds = self.narrow_bounds(self.lag_bounds(min_frequency, max_frequency), acf_bounds)
+
+        acf_values = self.autocorrelation.compute(buffer, window, 1, acf_bounds, bounds)
+        self.stages.lap("transform")
+        lag, peak = self.acf_peak(acf_values, bounds[0])
+
+        energy = np.dot(buffer[1:window + 1], buffer[1:window + 1])
+        confidence = float(np.clip(peak / energy, 0, 1)) if energy > 0 else 0.0
+        return self.sample_rate / lag, confidence
+
+    def acf_peak(self, acf_values, first_lag):
+        """
+        Returns the fractional lag and the height of the period peak, acf_values start at first_lag.
+        A periodic signal has peaks of about the same height at every multiple of its period,
+        and at low sample rates the highest sampled one is often a multiple. The peaks
+        are refined with a parabola, the shortest lag about as high as the highest wins.
+        """
+        best = int(np.argmax(acf_values))
+        limit = self.ACF_CANDIDATE_RATIO * acf_values[best]
+        inner = acf_values[1:-1]
+        candidates = np.flatnonzero((inner > acf_values[:-2]) & (inner >= acf_values[2:]) & (inner >= limit)) + 1
+
+        peaks = [parabolic_peak(acf_values, index) for index in candidates[candidates < best]]
+        lag, peak = parabolic_peak(acf_values, best)
+        for candidate, height in peaks:
+            if height >= self.ACF_PEAK_RATIO * peak:
+                return first_lag + candidate, height
+        return first_lag + lag, peak
+
+    def detect_yin(self):
+        """
+        YIN pitch detection on the current buffer.
+        """
+        min_frequency, max_frequency = self.search.next_range()
+        bounds = self.yin_bounds
+        if not self.search.full_scan:
+            bounds = self.narrow_bounds(self.lag_bounds(min_frequency, max_frequency),
+                                        bounds or (self.yin.min_lag, self.yin.max_lag))
+        result = self.get_yin(self.analysis_length).detect(self.analysed_samples(), bounds)
+        self.stages.lap("transform")  # YIN picks its dip together with the transform
+        return result
@@ -0,0 +1,69 @@
+"""
+Frequency range searched by the pitch detector.
+"""
+import numpy as np
+
+
+class PitchSearch:
+    """
+    The full range is the range of plausible pitches of the instrument (see
+    PitchDetector.set_pitch_range()). Once `lock_frames` consecutive confident
+    estimates stay within a few cents of each other, the note is locked and the
+    search is narrowed to +-`tracking_cents` around the last estimate.
+    The full range is searched again every `rescan_interval` frames and as soon
+    as the estimate gets unreliable or moves too far from the last one.
+    """
+
+    def __init__(self, min_frequency, max_frequency, tracking=True, tracking_cents=100, lock_frames=3,
+                 lock_confidence=0.8, rescan_interval=16):
+        self.tracking = tracking
+        self.tracking_cents = tracking_cents
+        self.lock_frames = lock_frames
+        self.lock_confidence = lock_confidence
+        self.rescan_interval = rescan_interval
+
+        self.set_range(min_frequency, max_frequency)
+
+    def set_range(self, min_frequency, max_frequency):
+        """
+        Setting the full range in Hz, the lock is released.
+        """
+        if not 0 < min_frequency < max_frequency:
+            raise ValueError(f"Invalid pitch range: {min_frequency} - {max_frequency} Hz")
+
+        self.min_frequency = min_frequency
+        self.max_frequency = max_frequency
+        self.reset()
+
+    def reset(self):
+        self.locked = False
+        self.center = None
+        self.hits = 0
+        self.full_scan = True
+        self.frames_since_rescan = 0
+
+    def next_range(self):
+        """
+        Returns the range (min, max) in Hz to search in the next frame.
+        """
+        self.full_scan = not self.locked or self.frames_since_rescan >= self.rescan_interval
+        if self.full_scan:
+            return self.min_frequency, self.max_frequency
+
+        ratio = 2 ** (self.tracking_cents / 1200)
+        return max(self.center / ratio, self.min_frequency), min(self.center * ratio, self.max_frequency)
+
+    def update(self, frequency, confidence):
+        """
+        Updating the lock with the estimate of the frame searched with next_range().
+        """
+        if confidence < self.lock_confidence or not self.min_frequency <= frequency <= self.max_frequency:
+            self.hits = 0
+        elif self.hits and abs(1200 * np.log2(frequency / self.center)) <= self.tracking_cents / 2:
+            self.hits += 1
+        else:
+            self.hits = 1
+
+        self.center = frequency if self.hits else None
+        self.locked = self.tracking and self.hits >= self.lock_frames
+        self.frames_since_rescan = 0 if self.full_scan else self.frames_since_rescan + 1
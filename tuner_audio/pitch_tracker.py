@@ -0,0 +1,117 @@
+"""
+Temporal pitch tracking: smooths the per-frame frequencies of a detector.
+"""
+from collections import deque
+
+from tuner_audio.note_table import NoteTable
+
+NO_PITCH = float("nan")
+
+
+class PitchTracker:
+    """
+    Tracks the pitch (as a fractional note number, A4 = 69) of a stream of frequencies:
+    1. the reading is compared with the median of the last median_size readings, one
+       more than outlier_cents away from it is replaced by the median (octave errors,
+       single wrong peaks),
+    2. a scalar Kalman filter (random walk with a standard deviation of process_cents
+       per frame, measured with measurement_cents) follows the pitch in O(1) per frame,
+    3. two consecutive readings that agree with each other but are more than jump_cents
+       from the estimate are a new note: the filter restarts at once instead of gliding,
+    4. the note only changes when the estimate is more than 50 + hysteresis_cents cents
+       from it, so a pitch between two notes does not flicker.
+    Frequencies and note numbers are converted with the lookups of a NoteTable (shared
+    with the caller), the tracked pitch is reset when its A4 frequency changes.
+    """
+
+    def __init__(self, note_table=None, median_size=5, outlier_cents=50, process_cents=3.0,
+                 measurement_cents=8.0, jump_cents=80, hysteresis_cents=15):
+        self.note_table = note_table if note_table is not None else NoteTable()
+        self.a4_frequency = self.note_table.a4_frequency
+        self.outlier = outlier_cents / 100
+        self.jump = jump_cents / 100
+        self.hysteresis = hysteresis_cents / 100
+
+        # Kalman variances in semitones^2
+        self.process_variance = (process_cents / 100) ** 2
+        self.measurement_variance = (measurement_cents / 100) ** 2
+
+        self.readings = deque(maxlen=median_size)
+        self.reset()
+
+    def reset(self):
+        """
+        Forgetting the tracked pitch, e.g. when the signal stops.
+        """
+        self.readings.clear()
+        self.previous = None   # last reading (note number)
+        self.estimate = None   # tracked note number, None - no pitch
+        self.variance = 0.0
+        self.note = None       # note number with hysteresis
+
+    def restart(self, numbers):
+        """
+        Starting the filter at the last of the given readings.
+        """
+        self.readings.clear()
+        self.readings.extend(numbers)
+        self.estimate = numbers[-1]
+        self.variance = self.measurement_variance
+        self.note = round(self.estimate)
+
+    def update(self, frequency):
+        """
+        Adding the frequency of a frame. Returns the tracked frequency, NO_PITCH for a
+        frame without a frequency (the tracker is reset).
+        """
+        if self.note_table.a4_frequency != self.a4_frequency:
+            self.a4_frequency = self.note_table.a4_frequency
+            self.reset()
+        if not 0 < frequency < float("inf"):
+            self.reset()
+            return NO_PITCH
+
+        number = self.note_table.number(frequency)
+        previous, self.previous = self.previous, number
+
+        if self.estimate is None:
+            self.restart([number])
+            return self.frequency
+
+        if abs(number - self.estimate) > self.jump:
+            # a new note needs two agreeing readings, a single one is an outlier
+            if previous is not None and abs(number - previous) <= self.outlier:
+                self.restart([previous, number])
+            return self.frequency
+
+        self.readings.append(number)
+        median = sorted(self.readings)[len(self.readings) // 2]
+        if abs(number - median) > self.outlier:
+            number = median
+
+        self.variance += self.process_variance
+        gain = self.variance / (self.variance + self.measurement_variance)
+        self.estimate += gain * (number - self.estimate)
+        self.variance *= 1 - gain
+
+        if abs(self.estimate - self.note) > 0.5 + self.hysteresis:
+            self.note = round(self.estimate)
+        return self.frequency
+
+    @property
+    def frequency(self):
+        """
+        Tracked frequency in Hz (NO_PITCH without a pitch).
+        """
+        if self.estimate is None:
+            return NO_PITCH
+        return self.note_table.fractional_frequency(self.estimate)
+
+    @property
+    def cents(self):
+        """
+        Cents of the tracked pitch from the note (between -50 - hysteresis and 50 + hysteresis).
+        """
+        if self.estimate is None:
+            return NO_PITCH
+        return (self.estimate - self.note) * 100
@@ -0,0 +1,120 @@
+"""
+Polyphonic detection: the deviation of every string of a tuning from one strummed chord.
+"""
+import numpy as np
+
+from tuner_audio.ring_buffer import RingBuffer
+
+
+class PolyphonicDetector:
+    """
+    Harmonic comb matched against the strings of a tuning.
+
+    For every string the candidate pitches from -search_cents to +search_cents around
+    its target (cent_step apart) are scored by the weighted sum of the magnitude
+    spectrum at their first num_harmonics harmonics (weights 1 / harmonic). The bins
+    and interpolation weights of all (string, candidate, harmonic) triples only depend
+    on the tuning, so they are computed once in set_tuning(), and a frame is scored
+    with one FFT, one gather and one batched product for all strings at once.
+    The best candidate of a string is refined with a parabola through its neighbours.
+    Harmonics that coincide with a harmonic of another string are left out (see
+    shared_harmonics_mask), fundamentals are always kept.
+
+    A string counts as sounding if its best score is at least `presence` times the
+    score of a flat spectrum at the median magnitude, and the peak is not at the edge
+    of the search range.
+    """
+
+    def __init__(self, sample_rate, chunk_size, buffer_chunks=12, num_harmonics=8, search_cents=100,
+                 cent_step=2, presence=8.0):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.buffer_length = chunk_size * buffer_chunks
+        self.num_harmonics = num_harmonics
+        self.presence = presence
+
+        # zero padding to twice the buffer halves the bin width of the comb interpolation
+        self.fft_size = 1 << (2 * self.buffer_length - 1).bit_length()
+        self.num_bins = self.fft_size // 2 + 1
+        self.window = np.hanning(self.buffer_length)
+
+        self.cents = np.arange(-search_cents, search_cents + cent_step / 2, cent_step, dtype=float)
+        self.cent_step = cent_step
+        self.harmonic_weights = 1 / np.arange(1, num_harmonics + 1)
+
+        # reusable buffers, the tail of `windowed` stays zero (padding)
+        self.ring_buffer = RingBuffer(self.buffer_length)
+        self.windowed = np.zeros(self.fft_size)
+        self.magnitude = np.zeros(self.num_bins)
+
+        self.targets = np.zeros(0)
+        self.comb_bins = np.zeros((0, len(self.cents), 2 * num_harmonics), dtype=np.intp)
+        self.comb_weights = np.zeros((0, len(self.cents), 2 * num_harmonics))
+        self.flat_scores = np.zeros(0)
+
+    def set_tuning(self, tuning, note_table):
+        """
+        Precomputing the comb of every string of a tuning (see tuner_audio/instruments.py)
+        for the A4 frequency of a NoteTable.
+        """
+        tuning.update(note_table)
+        self.targets = np.array(tuning.frequencies)
+
+        # fractional bins of every harmonic of every candidate: (strings, candidates, harmonics)
+        candidates = self.targets[:, None] * 2 ** (self.cents / 1200)
+        positions = candidates[:, :, None] * np.arange(1, self.num_harmonics + 1) * self.fft_size / self.sample_rate
+
+        # harmonics above 80 % of the Nyquist frequency (the passband of the decimator) are left out
+        weights = np.where(positions < 0.8 * (self.num_bins - 1), self.harmonic_weights, 0.0)
+        weights = weights * self.shared_harmonics_mask()[:, None, :]
+        positions = np.minimum(positions, self.num_bins - 2)
+
+        # linear interpolation between the two neighbouring bins
+        low = np.floor(positions).astype(np.intp)
+        fraction = positions - low
+        self.comb_bins = np.concatenate((low, low + 1), axis=2)
+        self.comb_weights = np.concatenate((weights * (1 - fraction), weights * fraction), axis=2)
+        self.flat_scores = self.comb_weights[:, 0, :].sum(axis=1)
+        self.reset()
+
+    def shared_harmonics_mask(self):
+        """
+        Returns a (strings, harmonics) mask that is 0 for the harmonics (above the fundamental)
+        of a string that lie within search_cents of a harmonic of another string. Those
+        belong to both strings (e.g. the 3rd harmonic of E2 and B3) and would pull them together.
+        """
+        harmonics = np.arange(1, self.num_harmonics + 1)
+        partials = np.log2(self.targets[:, None] * harmonics) * 1200  # (strings, harmonics) in cents
+        distance = np.abs(partials[:, :, None, None] - partials[None, None, :, :])
+        other = ~np.eye(len(self.targets), dtype=bool)[:, None, :, None]
+        shared = np.any((distance < self.cents[-1]) & other, axis=(2, 3))
+        shared[:, 0] = False
+        return np.where(shared, 0.0, 1.0)
+
+    def reset(self):
+        self.ring_buffer.clear()
+
+    def process(self, chunk):
+        """
+        Adding a chunk and scoring all strings. Returns the cents from the target of every
+        string (NaN if it does not sound) and the strength (best score / flat score).
+        """
+        self.ring_buffer.write(chunk)
+        self.ring_buffer.apply_window(self.window, self.windowed)
+        np.abs(np.fft.rfft(self.windowed), out=self.magnitude)
+
+        # (strings, candidates) scores of all combs in one gather and one batched product
+        scores = np.einsum("skh,skh->sk", self.magnitude[self.comb_bins], self.comb_weights)
+
+        strings = np.arange(len(scores))
+        best = np.argmax(scores, axis=1)
+        inner = np.clip(best, 1, scores.shape[1] - 2)
+        left, middle, right = scores[strings, inner - 1], scores[strings, inner], scores[strings, inner + 1]
+        denominator = left - 2 * middle + right
+        offset = np.where(denominator < 0, 0.5 * (left - right) / np.where(denominator < 0, denominator, -1), 0)
+        cents = self.cents[inner] + np.clip(offset, -1, 1) * self.cent_step
+
+        noise = max(float(np.median(self.magnitude)), np.finfo(float).tiny)
+        strength = scores[strings, best] / (noise * self.flat_scores)
+        sounding = (strength >= self.presence) & (best > 0) & (best < scores.shape[1] - 1)
+        return np.where(sounding, cents, np.nan), strength
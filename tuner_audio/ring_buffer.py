@@ -0,0 +1,70 @@
+"""
+Preallocated ring buffer for the audio window.
+"""
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-size audio window with a mirrored layout.
+
+    The storage holds every sample twice (at index i and i + length), so the
+    whole window, from the oldest to the newest sample, is always available as
+    one contiguous view without copying. Writing a chunk only touches
+    2 * len(chunk) samples and never allocates.
+    """
+
+    def __init__(self, length, dtype=float):
+        self.length = length
+        self.storage = np.zeros(2 * length, dtype=dtype)
+        self.start = 0  # index of the oldest sample
+
+    def write(self, chunk):
+        """
+        Appending a chunk (at most `length` samples), the oldest samples are overwritten.
+        """
+        size = len(chunk)
+        if size > self.length:
+            chunk = chunk[-self.length:]
+            size = self.length
+
+        first = min(size, self.length - self.start)
+        rest = size - first
+
+        self.storage[self.start:self.start + first] = chunk[:first]
+        self.storage[self.start + self.length:self.start + self.length + first] = chunk[:first]
+        if rest:
+            self.storage[:rest] = chunk[first:]
+            self.storage[self.length:self.length + rest] = chunk[first:]
+
+        self.start = (self.start + size) % self.length
+
+    def view(self):
+        """
+        Returns a contiguous read-only view of the window (oldest sample first).
+        """
+        window = self.storage[self.start:self.start + self.length]
+        window.flags.writeable = False
+        return window
+
+    def latest(self, size):
+        """
+        Returns a contiguous view of the newest `size` samples.
+        """
+        end = self.start + self.length
+        return self.storage[end - size:end]
+
+    def apply_window(self, window, out):
+        """
+        Multiplies the buffer by a window function into the beginning of `out`.
+        The rest of `out` is left untouched, so a zeroed scratch array acts as zero-padding.
+        """
+        np.multiply(self.view(), window, out=out[:self.length])
+        return out
+
+    def clear(self):
+        """
+        Setting all samples to zero.
+        """
+        self.storage.fill(0)
+        self.start = 0
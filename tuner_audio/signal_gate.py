@@ -0,0 +1,103 @@
+"""
+Signal gate: skips the pitch detection on quiet and noisy chunks.
+"""
+import numpy as np
+
+from tuner_audio.hop_splitter import HopSplitter
+
+
+class SignalGate:
+    """
+    Decides for every chunk whether it holds a tone worth analysing:
+    1. its RMS must be `margin` times above the noise floor (one dot product),
+    2. only then the spectral flatness of the chunk (geometric / arithmetic mean of
+       the power spectrum, about 0.56 for white noise and close to 0 for a tone)
+       must be below max_flatness.
+    Chunks that fail either test are noise: the noise floor drops to their RMS at
+    once and rises towards it with the time constant floor_time (seconds), so the
+    gate adapts to a louder room within a few seconds. Tones do not move the floor.
+    The floor never goes below min_rms (int16 units), so digital silence does not
+    open the gate for the faintest noise. After a tone the gate stays open for
+    hold_chunks chunks, short dips of a decaying note are still analysed.
+    """
+
+    def __init__(self, sample_rate, chunk_size, margin=4.0, min_rms=30.0, max_flatness=0.45, floor_time=1.0,
+                 hold_chunks=2):
+        self.margin = margin
+        self.min_rms = min_rms
+        self.max_flatness = max_flatness
+        self.hold_chunks = hold_chunks
+
+        # share of the distance to a louder noise RMS the floor moves per chunk
+        self.floor_rise = 1 - np.exp(-chunk_size / (sample_rate * floor_time))
+
+        self.splitter = HopSplitter(chunk_size)
+        self.window = np.hanning(chunk_size)
+        self.samples = np.zeros(chunk_size)
+        self.windowed = np.zeros(chunk_size)
+        self.power = np.zeros(chunk_size // 2 + 1)
+
+        self.noise_floor = min_rms
+        self.open_chunks = 0     # chunks the gate stays open without a tone
+        self.is_open = False     # decision of the newest hop
+        self.closed_chunks = 0   # number of skipped chunks, for the metrics
+        self.rms = 0.0
+        self.flatness = 1.0
+
+    def reset(self):
+        self.splitter.reset()
+        self.noise_floor = self.min_rms
+        self.open_chunks = 0
+        self.is_open = False
+
+    def spectral_flatness(self, chunk):
+        """
+        Returns the spectral flatness of a chunk, between 0 (one tone) and 1 (flat spectrum).
+        """
+        np.multiply(chunk, self.window, out=self.windowed)
+        power = self.power
+        np.abs(np.fft.rfft(self.windowed), out=power)
+        np.square(power, out=power)
+        power += np.finfo(float).tiny
+
+        mean = np.mean(power)
+        return float(np.exp(np.mean(np.log(power))) / mean)
+
+    def process(self, chunk):
+        """
+        Returns True if the chunk should be analysed. Reads are tested hop by hop (see
+        HopSplitter), the newest hop decides, a read that completes no hop keeps the decision.
+        """
+        for hop in self.splitter.hops(chunk):
+            self.is_open = self.process_hop(hop)
+        return self.is_open
+
+    def process_hop(self, chunk):
+        """
+        Testing one hop of chunk_size samples.
+        """
+        # float copy into a reusable buffer, the dot product of int16 samples would overflow
+        samples = self.samples
+        samples[:] = chunk
+        self.rms = rms = float(np.sqrt(np.dot(samples, samples) / len(samples)))
+
+        tone = rms >= self.margin * self.noise_floor
+        if tone:
+            self.flatness = self.spectral_flatness(samples)
+            tone = self.flatness <= self.max_flatness
+
+        if tone:
+            self.open_chunks = self.hold_chunks
+            return True
+
+        # noise: the floor follows it, down at once and up slowly
+        if rms < self.noise_floor:
+            self.noise_floor = max(rms, self.min_rms)
+        else:
+            self.noise_floor += self.floor_rise * (rms - self.noise_floor)
+
+        if self.open_chunks > 0:
+            self.open_chunks -= 1
+            return True
+        self.closed_chunks += 1
+        return False
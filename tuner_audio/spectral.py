@@ -0,0 +1,94 @@
+"""
+Precomputed spectral pipeline for the FFT pitch detector.
+"""
+import numpy as np
+
+
+class HarmonicProductSpectrum:
+    """
+    Harmonic Product Spectrum (HPS) with low-cut masking.
+
+    Everything that only depends on the FFT size is computed once:
+    the frequency axis, the low-cut bin and the length of every decimated
+    spectrum. The product is done in the log domain (a sum of logs), which
+    avoids floating-point underflow, and all work happens in reusable buffers.
+    """
+
+    def __init__(self, fft_size, sample_rate, num_hps=5, low_cut=60):
+        self.fft_size = fft_size
+        self.sample_rate = sample_rate
+        self.num_hps = num_hps
+        self.num_bins = fft_size // 2
+
+        # frequency axis of the first half of the FFT output
+        self.frequencies = np.fft.fftfreq(fft_size, 1. / sample_rate)[:self.num_bins]
+
+        # everything below the bin before the first one above low_cut is masked
+        self.low_cut_bin = max(int(np.argmax(self.frequencies > low_cut)) - 1, 0)
+
+        # bin k of the spectrum decimated by i is bin k * i, so it has ceil(num_bins / i) bins
+        self.decimated_lengths = [(i, -(-self.num_bins // i)) for i in range(2, num_hps + 1)]
+
+        # reusable output buffers
+        self.log_magnitude = np.zeros(self.num_bins)
+        self.log_hps = np.zeros(self.num_bins)
+        self.power = np.zeros(self.num_bins)
+
+    def process(self, magnitude, limit=None):
+        """
+        Returns the log HPS of a magnitude spectrum (at least fft_size // 2 bins),
+        with all bins below the low cut set to -inf.
+        With `limit` only the first `limit` bins of the HPS are computed (and returned),
+        which needs the log magnitude of just limit * num_hps bins.
+        """
+        limit = self.num_bins if limit is None else min(limit, self.num_bins)
+        log_magnitude = self.log_magnitude[:min(limit * self.num_hps, self.num_bins)]
+        np.maximum(magnitude[:len(log_magnitude)], np.finfo(float).tiny, out=log_magnitude)
+        np.log(log_magnitude, out=log_magnitude)
+
+        self.log_hps[:limit] = log_magnitude[:limit]
+        for i, length in self.decimated_lengths:
+            log_hps = self.log_hps[:min(length, limit)]
+            np.add(log_hps, log_magnitude[:len(log_hps) * i:i], out=log_hps)
+
+        self.log_hps[:self.low_cut_bin] = -np.inf
+        return self.log_hps[:limit]
+
+    def detect_pitch(self, magnitude, bounds=None):
+        """
+        Returns the frequency of the HPS peak and its bin index.
+        With `bounds` (first bin, last bin + 1) only that part of the HPS is searched.
+        """
+        if bounds is None:
+            bounds = (0, self.num_bins)
+        start, stop = max(bounds[0], 0), min(bounds[1], self.num_bins)
+
+        peak = start + int(np.argmax(self.process(magnitude, stop)[start:stop]))
+        return self.frequencies[peak], peak
+
+    def bin_bounds(self, min_frequency, max_frequency):
+        """
+        Returns the bins (first, last + 1) that cover a frequency range.
+        """
+        bin_width = self.sample_rate / self.fft_size
+        return (max(int(np.floor(min_frequency / bin_width)), 0),
+                min(int(np.ceil(max_frequency / bin_width)) + 1, self.num_bins))
+
+    def confidence(self, magnitude, peak, width=2):
+        """
+        Share of the spectral energy that lies within `width` bins of the
+        detected fundamental and its harmonics (0 - no tone, 1 - pure harmonic tone).
+        """
+        power = np.square(magnitude[:self.num_bins], out=self.power)
+        total = np.sum(power)
+        if total <= 0 or peak == 0:
+            return 0.0
+
+        harmonic_energy = 0.0
+        for harmonic in range(1, self.num_hps + 1):
+            center = peak * harmonic
+            if center - width >= self.num_bins:
+                break
+            harmonic_energy += np.sum(power[max(center - width, 0):center + width + 1])
+
+        return float(min(harmonic_energy / total, 1.0))
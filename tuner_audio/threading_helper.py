@@ -1,57 +1,122 @@
 """
-Custom safe List data structure (safe for usage in multiple threads).
+Thread-safe queues to share data between the audio thread and the GUI.
 """
-from threading import Lock
+from threading import Event
 
+import numpy as np
 
-class ProtectedList:
+
+class RingQueue:
     """
-    Queue to share data between Threads with lock protection.
-    Standard buffer length is only 8!
+    Single-producer/single-consumer ring queue backed by a fixed-size numpy array.
+
+    The head index is only written by the consumer and the tail index only by
+    the producer. Both only grow and reads/writes of a Python int are atomic,
+    so put() and get() do not take a lock.
+
+    When the queue is full, the policy decides what happens:
+    - "drop_oldest": the producer overwrites the oldest entry. The consumer notices
+      that entries were overwritten and skips them (counted in `dropped`),
+    - "block": the producer waits until the consumer made space.
+    `overflows` counts the puts on a full queue.
     """
 
-    def __init__(self, buffer_size = 8):
-        self.elements = []
-        self.buffer_size = buffer_size
-        self.lock = Lock()
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+
+    def __init__(self, capacity=8, policy=DROP_OLDEST, dtype=object):
+        if policy not in (self.DROP_OLDEST, self.BLOCK):
+            raise ValueError(f"Unknown queue policy '{policy}'")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.slots = np.empty(capacity, dtype=dtype)
+
+        self.head = 0     # index of the next element to get (consumer)
+        self.tail = 0     # index of the next element to put (producer)
+        self.writing = 0  # tail + 1 while the producer writes a slot (producer)
+
+        self.data_available = Event()
+        self.space_available = Event()
+        self.space_available.set()
+
+        self.overflows = 0
+        self.dropped = 0
 
-    def put(self, element):
+    def __len__(self):
+        return min(self.tail - self.head, self.capacity)
+
+    def put(self, element, timeout=None):
         """
-        Put in the queue.
+        Put in the queue. Returns False if the "block" policy timed out.
         """
-        self.lock.acquire()
+        tail = self.tail
+        if tail - self.head >= self.capacity:
+            self.overflows += 1
 
-        # append new element at the end of the list
-        self.elements.append(element)
+            if self.policy == self.BLOCK:
+                while self.tail - self.head >= self.capacity:
+                    self.space_available.clear()
+                    if self.tail - self.head < self.capacity:
+                        break
+                    if not self.space_available.wait(timeout):
+                        return False
 
-        # delete oldest element if list is too long
-        if len(self.elements) > self.buffer_size:
-            self.elements.pop(0)
+        # announce the write, so the consumer can tell that the slot is being overwritten
+        self.writing = tail + 1
+        self.slots[tail % self.capacity] = element
+        self.tail = tail + 1
 
-        self.lock.release()
+        self.data_available.set()
+        return True
 
-    def get(self):
+    def get(self, block=False, timeout=None):
         """
-        Get in the queue.
+        Get from the queue. Returns None if the queue is empty, or, with block=True,
+        if nothing arrived within `timeout` seconds (None waits forever).
         """
-        self.lock.acquire()
+        while True:
+            head = self.head
+            tail = self.tail
+
+            # entries that were overwritten by the producer are lost
+            if tail - head > self.capacity:
+                self.dropped += tail - self.capacity - head
+                head = tail - self.capacity
+                self.head = head
+
+            if head == tail:
+                if not block:
+                    return None
+
+                self.data_available.clear()
+                if self.tail != head:
+                    continue
+                if not self.data_available.wait(timeout):
+                    return None
+                continue
 
-        # check if something is in the list
-        if len(self.elements) > 0:
-            element = self.elements[0]
-            del self.elements[0]
+            element = self.slots[head % self.capacity]
 
-        # if list is empty return None
-        else:
-            element = None
+            # the producer started to overwrite this slot while it was read
+            if self.writing - head > self.capacity:
+                continue
 
-        self.lock.release()
-        return element
+            self.head = head + 1
+            self.space_available.set()
+            return element
 
     def __repr__(self):
-        self.lock.acquire()
+        head = max(self.head, self.tail - self.capacity)
+        return str([self.slots[i % self.capacity] for i in range(head, self.tail)])
 
-        string = str(self.elements)
 
-        self.lock.release()
-        return string
+class ProtectedList(RingQueue):
+    """
+    Queue to share data between Threads.
+    Standard buffer length is only 8! The oldest element is dropped when the queue is full.
+    """
+
+    def __init__(self, buffer_size=8, policy=RingQueue.DROP_OLDEST):
+        RingQueue.__init__(self, capacity=buffer_size, policy=policy)
+        self.buffer_size = buffer_size
@@ -0,0 +1,102 @@
+"""
+YIN pitch detector (de Cheveigné and Kawahara, 2002).
+"""
+import numpy as np
+
+from tuner_audio.autocorrelation import AutocorrelationPlan
+from tuner_audio.peak_interpolation import parabolic_vertex
+
+
+class YinDetector:
+    """
+    YIN pitch detection on a window of `window` samples:
+    - the difference function d(tau) = E(0) + E(tau) - 2 r(tau) is built from one
+      FFT autocorrelation r and running energies E (cumulative sums),
+    - the cumulative mean normalized difference function (CMNDF) d'(tau) removes the
+      bias towards small lags,
+    - the first dip below an absolute threshold is taken (which avoids most octave
+      errors) and refined with parabolic interpolation of d(tau), which is less
+      biased than that of d'(tau) at low sample rates (short lags).
+    The confidence (clarity) is 1 - d'(tau) at the chosen lag.
+
+    detect() needs window + max_lag + 1 samples.
+    """
+
+    def __init__(self, sample_rate, window, min_frequency=60, max_frequency=1500, threshold=0.1):
+        self.sample_rate = sample_rate
+        self.window = window
+        self.threshold = threshold
+
+        self.min_lag = max(int(np.floor(sample_rate / max_frequency)), 2)
+        self.max_lag = int(np.ceil(sample_rate / min_frequency))
+        self.signal_length = self.window + self.max_lag + 1
+
+        self.plan = AutocorrelationPlan(self.window, (0, self.max_lag + 1))
+
+        # reusable buffers
+        self.lags = np.arange(self.max_lag + 1)
+        self.squares = np.zeros(self.signal_length + 1)
+        self.energy = np.zeros(self.max_lag + 1)
+        self.difference = np.zeros(self.max_lag + 1)
+        self.cumulative = np.zeros(self.max_lag + 1)
+        self.cmndf = np.zeros(self.max_lag + 1)
+
+    def cumulative_mean_normalized_difference(self, signal):
+        """
+        Returns the CMNDF d'(tau) for tau in [0, max_lag] of the first signal_length samples.
+        """
+        signal = signal[:self.signal_length]
+
+        # E(tau) = sum of x_j^2 for j in [tau, tau + window)
+        np.square(signal, out=self.squares[1:])
+        np.cumsum(self.squares, out=self.squares)
+        np.subtract(self.squares[self.window:self.window + self.max_lag + 1],
+                    self.squares[:self.max_lag + 1], out=self.energy)
+
+        # d(tau) = E(0) + E(tau) - 2 r(tau)
+        correlation = self.plan.compute(signal, 0)
+        np.multiply(correlation, -2, out=self.difference)
+        self.difference += self.energy
+        self.difference += self.energy[0]
+        np.maximum(self.difference, 0, out=self.difference)
+
+        # a silent window has no periodicity
+        if self.energy[0] <= 0:
+            self.cmndf.fill(1)
+            return self.cmndf
+
+        # d'(tau) = d(tau) * tau / sum(d(1..tau)), d'(0) = 1
+        np.cumsum(self.difference, out=self.cumulative)
+        np.maximum(self.cumulative, np.finfo(float).tiny, out=self.cumulative)
+        np.multiply(self.difference, self.lags, out=self.cmndf)
+        np.divide(self.cmndf, self.cumulative, out=self.cmndf)
+        self.cmndf[0] = 1
+        return self.cmndf
+
+    def detect(self, signal, lag_bounds=None):
+        """
+        Returns the detected frequency and the confidence (0 - no periodicity, 1 - perfectly periodic).
+        With `lag_bounds` (first lag, last lag + 1) only those lags are searched.
+        """
+        min_lag, max_lag = self.min_lag, self.max_lag
+        if lag_bounds is not None:
+            min_lag, max_lag = max(lag_bounds[0], min_lag), min(lag_bounds[1], max_lag)
+
+        cmndf = self.cumulative_mean_normalized_difference(signal)
+        search = cmndf[min_lag:max_lag]
+
+        # first dip under the threshold, followed down to its local minimum
+        below = np.flatnonzero(search < self.threshold)
+        if len(below):
+            tau = int(below[0])
+            while tau + 1 < len(search) and search[tau + 1] < search[tau]:
+                tau += 1
+        else:
+            tau = int(np.argmin(search))
+        tau += min_lag
+
+        confidence = float(np.clip(1 - cmndf[tau], 0, 1))
+        return self.sample_rate / self.parabolic_lag(self.difference, tau), confidence
+
+    # refines the position of a minimum with a parabola through its neighbours
+    parabolic_lag = staticmethod(parabolic_vertex)
@@ -0,0 +1,137 @@
+"""
+Headless command line interface of the tuner.
+
+Usage:
+    python3 tuner_cli.py analyze recording.wav --format csv --output result.csv
+    python3 tuner_cli.py analyze recording.wav --tuning guitar/drop_d --track
+    python3 tuner_cli.py batch recordings/ --output results.jsonl --resume
+    python3 tuner_cli.py benchmark --output benchmark.json --compare previous.json
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+
+from tuner_audio.audio_source import AudioSourceError
+from tuner_audio.offline_analysis import WRITERS, analyze_wav
+from tuner_audio.batch_analysis import run_batch
+from tuner_audio.benchmark import SIGNALS, format_report, run_benchmark
+from tuner_audio.instruments import get_instrument, load_user_tunings
+from tuner_audio.pitch_detector import PitchDetector
+from tuner_audio.note_table import NoteTable
+from tuner_audio.pitch_tracker import PitchTracker
+from settings import Settings
+
+
+def parse_tuning(value):
+    """
+    Returns the Tuning of an 'instrument' or 'instrument/tuning' argument.
+    """
+    load_user_tunings(os.path.dirname(os.path.abspath(__file__)) + Settings.USER_TUNINGS_PATH)
+
+    name, _, tuning = value.partition("/")
+    try:
+        instrument = get_instrument(name)
+        if tuning:
+            instrument.set_tuning(tuning)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return instrument.tuning
+
+
+def analyze_command(args):
+    """
+    Analysing one WAV file and writing the per-frame table.
+    """
+    tracker = PitchTracker(NoteTable(args.a4)) if args.track else None
+    rows = analyze_wav(args.file, method=args.method, a4_frequency=args.a4, tuning=args.tuning, tracker=tracker)
+    writer = WRITERS[args.format]
+
+    try:
+        # the file is opened by the first row, before the output is created
+        rows = itertools.chain(list(itertools.islice(rows, 1)), rows)
+        if args.output is None:
+            writer(rows, sys.stdout)
+        else:
+            with open(args.output, "w", newline="") as file:
+                writer(rows, file)
+    except AudioSourceError as e:
+        sys.stderr.write(f'Error: {e}\n')
+        sys.exit(1)
+
+
+def batch_command(args):
+    """
+    Analysing every WAV file of a directory in parallel.
+    """
+    run_batch(args.directory, args.output, method=args.method, a4_frequency=args.a4,
+              workers=args.workers, resume=args.resume, track=args.track)
+
+
+def benchmark_command(args):
+    """
+    Benchmarking the detection pipeline on synthetic signals.
+    """
+    previous = None
+    if args.compare is not None:
+        with open(args.compare) as file:
+            previous = json.load(file)
+
+    report = run_benchmark(signals=args.signals, duration=args.duration, progress=sys.stderr)
+    print(format_report(report, previous))
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+def build_parser():
+    """
+    Building the argument parser.
+    """
+    parser = argparse.ArgumentParser(description="Headless pitch analysis of audio recordings.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    analyze_parser = subparsers.add_parser("analyze", help="analyse one WAV file")
+    analyze_parser.add_argument("file", help="path to a PCM WAV file")
+    analyze_parser.add_argument("--method", choices=PitchDetector.METHODS, default="autocorr",
+                                help="pitch detection method (default: autocorr)")
+    analyze_parser.add_argument("--a4", type=float, default=440, help="frequency of A4 in Hz (default: 440)")
+    analyze_parser.add_argument("--tuning", type=parse_tuning,
+                                help="'instrument' or 'instrument/tuning' (e.g. guitar/drop_d), "
+                                     "adds the nearest string and its cents")
+    analyze_parser.add_argument("--format", choices=sorted(WRITERS), default="csv",
+                                help="output format (default: csv)")
+    analyze_parser.add_argument("--output", help="output file (default: stdout)")
+    analyze_parser.add_argument("--track", action="store_true",
+                                help="smooth the frequencies over time (median, Kalman filter)")
+    analyze_parser.set_defaults(function=analyze_command)
+
+    batch_parser = subparsers.add_parser("batch", help="analyse all WAV files of a directory on all cores")
+    batch_parser.add_argument("directory", help="directory with WAV files (searched recursively)")
+    batch_parser.add_argument("--output", required=True, help="results file, one JSON line per recording")
+    batch_parser.add_argument("--method", choices=PitchDetector.METHODS, default="autocorr",
+                              help="pitch detection method (default: autocorr)")
+    batch_parser.add_argument("--a4", type=float, default=440, help="frequency of A4 in Hz (default: 440)")
+    batch_parser.add_argument("--workers", type=int, help="number of worker processes (default: all cores)")
+    batch_parser.add_argument("--resume", action="store_true",
+                              help="skip recordings that are already in the results file")
+    batch_parser.add_argument("--track", action="store_true",
+                              help="smooth the frequencies over time (median, Kalman filter)")
+    batch_parser.set_defaults(function=batch_command)
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="benchmark every detector configuration")
+    benchmark_parser.add_argument("--output", help="JSON report file")
+    benchmark_parser.add_argument("--compare", help="previous JSON report to compare with")
+    benchmark_parser.add_argument("--signals", nargs="+", choices=SIGNALS, default=list(SIGNALS),
+                                  help="synthetic signals (default: all)")
+    benchmark_parser.add_argument("--duration", type=float, default=3, help="seconds per signal (default: 3)")
+    benchmark_parser.set_defaults(function=benchmark_command)
+
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = build_parser().parse_args()
+    arguments.function(arguments)
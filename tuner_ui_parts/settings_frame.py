@@ -7,7 +7,7 @@ from settings import Settings
 
 
 class SettingsFrame(tkinter.Frame):
-    def __init__(self, master, prev_frame="guitar", *args, **kwargs):
+    def __init__(self, master, *args, **kwargs):
         tkinter.Frame.__init__(self, master, *args, **kwargs)
 
         self.app_pointer = master
@@ -15,8 +15,6 @@ class SettingsFrame(tkinter.Frame):
         self.font_manager = self.app_pointer.font_manager
         self.image_manager = self.app_pointer.image_manager
 
-        self.prev_frame = prev_frame
-
         self.configure(bg=self.color_manager.background_layer_1)
 
         self.bottom_frame = tkinter.Frame(master=self,
@@ -33,7 +31,7 @@ class SettingsFrame(tkinter.Frame):
                                                corner_radius=10,
                                                width=110,
                                                height=40,
-                                               command=self.master.draw_main_frame if self.prev_frame == "guitar" else self.master.draw_ukulele_frame)
+                                               command=self.master.draw_tuner_frame)
         self.button_back.place(anchor=tkinter.SE, relx=0.95, rely=0.75)
 
         self.button_website = TkinterCustomButton(master=self.bottom_frame,
@@ -98,6 +96,18 @@ class SettingsFrame(tkinter.Frame):
                                                                  command=self.frequency_button_down)
         self.button_frequency_down.place(anchor=tkinter.CENTER, relx=0.5, rely=0.6)
 
+        # debug overlay with the live metrics, filled by App.update_metrics_overlay()
+        self.label_metrics = None
+        if Settings.METRICS_OVERLAY:
+            self.label_metrics = tkinter.Label(master=self,
+                                               bg=self.color_manager.background_layer_1,
+                                               fg=self.color_manager.text_2,
+                                               font=("Courier", 9),
+                                               justify=tkinter.LEFT,
+                                               anchor=tkinter.NW,
+                                               wraplength=Settings.WIDTH * 0.95)
+            self.label_metrics.place(anchor=tkinter.NW, relx=0.02, rely=0.64, relheight=0.16, relwidth=0.96)
+
     def update_color(self):
         self.configure(bg=self.color_manager.background_layer_1)
         self.bottom_frame.configure(bg=self.color_manager.background_layer_0)
@@ -123,6 +133,16 @@ class SettingsFrame(tkinter.Frame):
         self.button_frequency_up.label.configure(bg=self.color_manager.background_layer_1)
         self.button_frequency_down.label.configure(bg=self.color_manager.background_layer_1)
 
+        if self.label_metrics is not None:
+            self.label_metrics.configure(bg=self.color_manager.background_layer_1, fg=self.color_manager.text_2)
+
+    def set_metrics_text(self, text):
+        """
+        Setting the text of the debug overlay (if it is enabled).
+        """
+        if self.label_metrics is not None:
+            self.label_metrics.configure(text=text)
+
     def frequency_button_up(self):
         self.master.a4_frequency += 1
         self.label_frequency.set_text(str(self.master.a4_frequency) + " Hz")
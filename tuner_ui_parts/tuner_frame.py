@@ -1,21 +1,24 @@
 """
-Managing GUI ukulele frame.
+Managing GUI tuner frame.
 """
 import tkinter
-from math import sin, radians
 
 from tuner_ui_parts.tkinter_custom_button_imageset import TkinterCustomButtonImageset
 from tuner_ui_parts.tkinter_custom_button import TkinterCustomButton
+from tuner_ui_parts.tuner_renderer import TunerRenderer, needle_end
+from tuner_audio.instruments import next_instrument
 from settings import Settings
 
 
-class UkuleleFrame(tkinter.Frame):
+class TunerFrame(tkinter.Frame):
     """
-    Setting Main Frame.
+    Tuner display of one instrument (see tuner_audio/instruments.py).
+    The App builds the frame of an instrument when it is displayed for the first time.
     """
-    def __init__(self, master, *args, **kwargs):
+    def __init__(self, master, instrument, *args, **kwargs):
         tkinter.Frame.__init__(self, master, *args, **kwargs)
 
+        self.instrument = instrument
         self.app_pointer = master
         self.color_manager = self.app_pointer.color_manager
         self.font_manager = self.app_pointer.font_manager
@@ -117,6 +120,32 @@ class UkuleleFrame(tkinter.Frame):
                                                     command=None)
         self.button_frequency.place(anchor=tkinter.SW, relx=0.05, rely=0.9)
 
+        # switches between the single pitch and all strings at once (polyphonic mode)
+        self.button_strings = TkinterCustomButton(master=self.botton_frame,
+                                                  bg_color=self.color_manager.background_layer_0,
+                                                  fg_color=self.color_manager.theme_main,
+                                                  hover_color=self.color_manager.theme_light,
+                                                  text_font=self.font_manager.button_font,
+                                                  text="Strings",
+                                                  text_color=self.color_manager.text_main,
+                                                  corner_radius=10,
+                                                  width=90,
+                                                  height=40,
+                                                  command=self.master.toggle_polyphonic)
+        self.button_strings.place(anchor=tkinter.S, relx=0.5, rely=0.9)
+
+        # strip view of the polyphonic mode: name and cents of every string, hidden in single pitch mode
+        strings = self.instrument.tuning.strings
+        self.string_texts = [self.upper_canvas.create_text(Settings.CANVAS_SIZE * (index + 0.5) / len(strings),
+                                                           Settings.CANVAS_SIZE * 0.16,
+                                                           anchor=tkinter.N,
+                                                           justify=tkinter.CENTER,
+                                                           text=string + "\n-",
+                                                           fill=self.color_manager.text_2,
+                                                           font=self.font_manager.frequency_text_font,
+                                                           state=tkinter.HIDDEN)
+                             for index, string in enumerate(strings)]
+
         self.button_info = TkinterCustomButton(master=self.botton_frame,
                                                bg_color=self.color_manager.background_layer_0,
                                                fg_color=self.color_manager.theme_main,
@@ -130,27 +159,22 @@ class UkuleleFrame(tkinter.Frame):
                                                command=self.master.draw_settings_frame)
         self.button_info.place(anchor=tkinter.SE, relx=0.95, rely=0.9)
 
+        # shows the instrument, hovering shows the next one, which a click switches to
+        image = self.image_manager.get_instrument_image(self.instrument.image)
+        next_image = self.image_manager.get_instrument_image(next_instrument(self.instrument).image)
         self.button_inst = TkinterCustomButtonImageset(master=self,
                                                        bg_color=self.color_manager.background_layer_1,
-                                                       image_dict={"standard": self.image_manager.ukulele_image,
-                                                                   "clicked": self.image_manager.guitar_image,
-                                                                   "standard_hover": self.image_manager.ukulele_hovered_image,
-                                                                   "clicked_hover": self.image_manager.guitar_hovered_image},
-                                                       height=self.image_manager.ukulele_image.height(),
-                                                       width=self.image_manager.ukulele_image.width(),
-                                                       command=self.master.draw_main_frame)
+                                                       image_dict={"standard": image,
+                                                                   "clicked": next_image,
+                                                                   "standard_hover": next_image,
+                                                                   "clicked_hover": image},
+                                                       height=image.height(),
+                                                       width=image.width(),
+                                                       command=self.master.draw_next_instrument)
         self.button_inst.place(anchor=tkinter.NE, relx=0.95, rely=0.05)
 
-        # self.button_inst = TkinterCustomButtonImageset(master=self,
-        #                                                bg_color=self.color_manager.background_layer_1,
-        #                                                image_dict={"standard": self.image_manager.guitar_image,
-        #                                                            "clicked": self.image_manager.ukulele_image,
-        #                                                            "standard_hover": self.image_manager.guitar_hovered_image,
-        #                                                            "clicked_hover": self.image_manager.ukulele_hovered_image},
-        #                                                height=self.image_manager.guitar_image.height(),
-        #                                                width=self.image_manager.guitar_image.width(),
-        #                                                command=self.master.draw_ukulele_frame)
-        # self.button_inst.place(anchor=tkinter.NE, relx=0.95, rely=0.05)
+        # only the changed values of the display state are sent to Tk
+        self.renderer = TunerRenderer(self)
 
     def update_color(self):
         """
@@ -190,33 +214,65 @@ class UkuleleFrame(tkinter.Frame):
                                          hover_color=self.color_manager.theme_light,
                                          text_color=self.color_manager.text_main)
 
+        self.button_strings.configure_color(bg_color=self.color_manager.background_layer_0,
+                                            fg_color=self.color_manager.theme_main,
+                                            hover_color=self.color_manager.theme_light,
+                                            text_color=self.color_manager.text_main)
+
+        for string_text in self.string_texts:
+            self.upper_canvas.itemconfig(string_text, fill=self.color_manager.text_2)
+
+        self.renderer.invalidate()
+
+    def on_show(self):
+        """
+        Called when the frame gets displayed, the instrument button shows this instrument again.
+        """
+        self.button_inst.set_pressed(False)
+
+    def set_polyphonic(self, enabled):
+        """
+        Showing the strip view of all strings (polyphonic mode) instead of the frequency and
+        the neighbouring notes.
+        """
+        single_state, strip_state = (tkinter.HIDDEN, tkinter.NORMAL) if enabled else (tkinter.NORMAL, tkinter.HIDDEN)
+        for item in (self.frequency_text, self.lower_note_text, self.higher_note_text):
+            self.upper_canvas.itemconfig(item, state=single_state)
+        for string_text in self.string_texts:
+            self.upper_canvas.itemconfig(string_text, state=strip_state)
+        self.button_strings.set_text("Single" if enabled else "Strings")
+
+    def set_string(self, index, text, color):
+        """
+        Setting the text of a string in the strip view, green if it is in tune.
+        """
+        fill = self.color_manager.needle_hit if color == "green" else self.color_manager.text_2
+        self.upper_canvas.itemconfig(self.string_texts[index], text=text, fill=fill)
+
     def set_needle_color(self, color):
         """
-        Setting needle color.
+        Setting needle color (the font of the note label is set once in __init__).
         """
         if color == "green":
             self.under_canvas.itemconfig(self.display_needle,
                                          fill=self.color_manager.needle_hit)
-            self.note_label.configure(fg=self.color_manager.text_2_highlight,
-                                      font=self.font_manager.note_display_font)
+            self.note_label.configure(fg=self.color_manager.text_2_highlight)
         elif color == "red":
             self.under_canvas.itemconfig(self.display_needle,
                                          fill=self.color_manager.needle)
-            self.note_label.configure(fg=self.color_manager.text_2,
-                                      font=self.font_manager.note_display_font)
+            self.note_label.configure(fg=self.color_manager.text_2)
 
     def set_needle_angle(self, deg):
         """
         Setting needle angle.
         """
-        x = sin(radians(180 - deg))
-        y = sin(radians(270 - deg))
+        x, y = needle_end(deg)
 
         self.under_canvas.coords(self.display_needle,
                                  Settings.CANVAS_SIZE * 0.5,
                                  Settings.CANVAS_SIZE * 0.5,
-                                 Settings.CANVAS_SIZE * 0.5 + (Settings.CANVAS_SIZE * 0.45 * x),
-                                 Settings.CANVAS_SIZE * 0.5 + (Settings.CANVAS_SIZE * 0.45 * y))
+                                 x,
+                                 y)
         return x, y
 
     def set_note_names(self, note_name, note_name_lower, note_name_higher):
@@ -229,9 +285,10 @@ class UkuleleFrame(tkinter.Frame):
 
     def set_frequency(self, frequency):
         """
-        Setting frequency.
+        Setting frequency, None shows that there is no signal.
         """
-        self.upper_canvas.itemconfig(self.frequency_text, text=str(round(frequency, 1)) + " Hz")
+        text = "- Hz" if frequency is None else str(round(frequency, 1)) + " Hz"
+        self.upper_canvas.itemconfig(self.frequency_text, text=text)
 
     def set_frequency_difference(self, frequency):
         """
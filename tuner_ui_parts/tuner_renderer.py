@@ -0,0 +1,86 @@
+"""
+Render layer of the tuner frames.
+"""
+from math import sin, radians
+
+from settings import Settings
+
+
+def needle_end(deg):
+    """
+    Canvas coordinates of the tip of the display needle at an angle in degrees.
+    """
+    x = sin(radians(180 - deg))
+    y = sin(radians(270 - deg))
+    return (Settings.CANVAS_SIZE * 0.5 + (Settings.CANVAS_SIZE * 0.45 * x),
+            Settings.CANVAS_SIZE * 0.5 + (Settings.CANVAS_SIZE * 0.45 * y))
+
+
+class TunerRenderer:
+    """
+    Keeps the last rendered display state of a TunerFrame
+    and only emits the Tk calls for the values that changed. Every Tk call is a round
+    trip through Tcl, and most values (note names, color, rounded frequency) stay the
+    same for many frames. Needle moves below NEEDLE_THRESHOLD pixels are skipped.
+
+    render() takes the display state of App.process_frequency(), render_strings()
+    the one of App.process_strings().
+    """
+
+    NEEDLE_THRESHOLD = 0.5  # px
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.rendered = {}
+        self.rendered_needle_end = None
+
+    def invalidate(self):
+        """
+        Forgetting the rendered state, so the next render() draws everything
+        (e.g. after a color change).
+        """
+        self.rendered = {}
+        self.rendered_needle_end = None
+
+    def changed(self, key, value):
+        """
+        Returns True and remembers the value if it differs from the rendered one.
+        """
+        if key in self.rendered and self.rendered[key] == value:
+            return False
+        self.rendered[key] = value
+        return True
+
+    def render(self, view):
+        frame = self.frame
+
+        if self.changed("needle_color", view["needle_color"]):
+            frame.set_needle_color(view["needle_color"])
+
+        end = needle_end(view["needle_angle"])
+        if self.rendered_needle_end is None or max(abs(end[0] - self.rendered_needle_end[0]),
+                                                   abs(end[1] - self.rendered_needle_end[1])) >= self.NEEDLE_THRESHOLD:
+            frame.set_needle_angle(view["needle_angle"])
+            self.rendered_needle_end = end
+
+        # the three names change together with the note
+        note_names = (view["note_name"], view["note_name_lower"], view["note_name_higher"])
+        if self.changed("note_names", note_names):
+            frame.set_note_names(*note_names)
+
+        if self.changed("frequency_difference", view["frequency_difference"]):
+            frame.set_frequency_difference(view["frequency_difference"])
+
+        # the label shows one decimal, None is no signal
+        frequency = view["frequency"]
+        if self.changed("frequency", None if frequency is None else round(frequency, 1)):
+            frame.set_frequency(frequency)
+
+    def render_strings(self, strings):
+        """
+        Rendering the strip view of the polyphonic mode, `strings` holds the (text, color)
+        of every string (see App.process_strings()).
+        """
+        for index, string in enumerate(strings):
+            if self.changed(("string", index), string):
+                self.frame.set_string(index, *string)